@@ -36,3 +36,12 @@ Feature: 001 Register Customer Account on Parabank
     When the user makes the "POST" request to the endpoint.
     Then the request fails with the status code "500".
     And the customer account is not registered.
+
+  Scenario: 1.6 - A user can load the public pages of Parabank at the same time with one JSESSIONID.
+    Given the user has already visited the homepage of parabank.
+    When the user makes the following requests concurrently.
+      | request_type | endpoint                                   | status_code |
+      | GET          | homepage_endpoint                          | 200         |
+      | GET          | register_customer_with_session_id_endpoint | 200         |
+      | GET          | login_endpoint                             | 200         |
+    Then the request passes with the status code "200".
@@ -9,16 +9,27 @@ Feature: 100 Register Customer Account.
 
   Scenario: 100.2 - a new user can create a customer account by providing required details.
     Given the user is already on the registration page of Parabank.
-    When the user enters "fname" in the "First Name" field.
-    And the user enters "lname" in the "Last Name" field.
-    And the user enters "addr" in the "Address" field.
-    And the user enters "city" in the "City" field.
-    And the user enters "state" in the "State" field.
-    And the user enters "zip code" in the "Zip Code" field.
-    And the user enters "1122" in the "SSN" field.
-    And the user enters "admin" in the "Username" field.
-    And the user enters "Test@123" in the "Password" field.
-    And the user enters "Test@123" in the "Confirm" field.
+    When the user fills in the form with the following details.
+      | field      | value    |
+      | First Name | fname    |
+      | Last Name  | lname    |
+      | Address    | addr     |
+      | City       | city     |
+      | State      | state    |
+      | Zip Code   | zip code |
+      | SSN        | 1122     |
+      | Username   | admin    |
+      | Password   | Test@123 |
+      | Confirm    | Test@123 |
     And the user submits the form by clicking on the Register button.
     Then the user is redirected to "Dashboard" page.
     And the user can see a message "Welcome".
+
+  Scenario: 100.3 - a newly registered customer can see the accounts overview.
+    Given a new customer registered through the API is on the accounts overview page of Parabank.
+    Then the user can see a message "Accounts Overview".
+
+  @create_account
+  Scenario: 100.4 - a registered customer can see the accounts overview after logging in.
+    Given the customer logged in through the API is on the accounts overview page of Parabank.
+    Then the user can see a message "Accounts Overview".
@@ -3,10 +3,10 @@ import logging
 import logging.config
 
 from behave import use_fixture
-from selenium.webdriver.common.by import By
-from xvfbwrapper import Xvfb
 
-from steps import fixtures, constants
+from steps import (account_pool, async_requests, browser_pool, browser_profiles, cassette, dom_snapshot, fixtures,
+                   http_cache, http_session, locators, resilience, resource_blocking, screenshots, session_cache,
+                   stub_server, utils, virtual_display)
 
 logger = logging.getLogger('myLogger')
 
@@ -16,23 +16,47 @@ def before_all(context):
     if not context.config.log_capture:
         logging.config.fileConfig('behave_logging.ini')
 
-    if context.config.userdata.get('headless').lower() == 'true':
-        context.virtual_display = Xvfb()
-        context.virtual_display.start()
-        logger.debug('--- Initiated Virtual Display ---')
-        context.test_headless = True
-    else:
-        # Headless testing enabled by passing option -D headless
-        context.test_headless = False
+    if context.config.userdata.get('stub_server', 'false').lower() == 'true':
+        # The in-process stand-in replaces the server from behave.ini for a hermetic run.
+        context.stub_server = stub_server.start_stub_server(context)
+
+    # Headless testing enabled by passing option -D headless, the display is started by the first web scenario.
+    context.test_headless = context.config.userdata.get('headless', 'false').lower() == 'true'
+
+    # An invalid HEADLESS_MODE fails the run before the first scenario.
+    virtual_display.get_headless_mode(context)
+
+    resilience.configure(context)
+    http_cache.configure(context)
+    resource_blocking.configure(context)
+    utils.warm_up_http_session(context)
+    session_cache.configure(context)
+    account_pool.configure(context)
 
 
 def before_scenario(context, scenario):
     logger.debug('--------\n')
     logger.debug(f'Scenario: {scenario.name}')
 
+    # Once the server is deemed down the remaining scenarios are skipped or failed without sending any request.
+    resilience.start_scenario(context, scenario)
+
+    if scenario.status.name == 'skipped':
+        return
+
     if 'web' in (scenario.feature.tags + scenario.tags):
         # Web based scenarios will be tested in the browser.
+        virtual_display.start(context)
         use_fixture(fixtures.test_in_browser, context)
+        resource_blocking.apply(context, scenario.feature.tags + scenario.tags)
+
+
+def after_scenario(context, scenario):
+    session_cache.release_session(context, scenario)
+
+    # The browser is still leased here, it is returned to the pool once the scenario is cleaned up.
+    if hasattr(context, 'browser'):
+        resource_blocking.collect(context)
 
 
 def after_step(context, step):
@@ -42,18 +66,13 @@ def after_step(context, step):
     if pipeline_stage is None:
 
         if step.status == 'failed' and hasattr(context, 'browser'):
-            screenshots_dir_path = str(constants.BackOfficeConstant.screenshots_dir_path.value)
-
-            if not os.path.isdir(screenshots_dir_path):
-                os.mkdir(screenshots_dir_path)
-
-            screenshot_file_path = f'{screenshots_dir_path + context.scenario.name}.png'
-            context.browser.find_element(By.CSS_SELECTOR, 'body').screenshot(screenshot_file_path)
+            screenshots.save_screenshot(context, step)
 
 
 def before_tag(context, tag):
 
-    if tag == 'create_account':
+    # Tag hooks run before before_scenario, which skips the scenario while the circuit breaker is open.
+    if tag == 'create_account' and not resilience.breaker.is_open():
         use_fixture(fixtures.create_account, context)
 
 
@@ -64,6 +83,25 @@ def after_tag(context, tag):
 
 def after_all(context):
 
-    if context.config.userdata.get('headless').lower() == 'true':
-        logger.debug('< Closed the virtual display.')
-        context.virtual_display.stop()
+    # The browsers are quit before the virtual display they run on is stopped.
+    browser_pool.close()
+    browser_profiles.close()
+    locators.close()
+    dom_snapshot.close()
+    screenshots.close()
+    resource_blocking.close()
+
+    virtual_display.close()
+
+    account_pool.close()
+    session_cache.close()
+    async_requests.close_engines()
+    resilience.close()
+    http_cache.close()
+    utils.export_http_metrics(context)
+    cassette.close()
+    http_session.close_sessions()
+    logger.debug('< Closed the pooled HTTP sessions.')
+
+    if hasattr(context, 'stub_server'):
+        context.stub_server.stop()
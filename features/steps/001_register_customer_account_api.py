@@ -1,9 +1,8 @@
-import copy
 import logging
 
 from behave import given, when, then
 
-from steps import utils, constants
+from steps import async_requests, data_factory, request_spec, session_cache, utils, constants
 
 logger = logging.getLogger('myLogger')
 
@@ -11,14 +10,33 @@ logger = logging.getLogger('myLogger')
 # Scenario 1
 @given(u'the user has a public endpoint to visit homepage of parabank.')
 def step_impl(context):
-    context.endpoint = constants.ApiEndpoint.homepage_endpoint.value
+    # Not cacheable, the homepage hands out a new JSESSIONID to every visitor without one.
+    context.request_spec = request_spec.get_route_spec(constants.ApiEndpoint.homepage_endpoint)
 
 
 @when(u'the user makes the "{request_type}" request to the endpoint.')
 def step_impl(context, request_type):
+    session_cache.track_request(context, request_type)
     utils.make_request(context, _request_type=request_type)
 
 
+@when(u'the user makes the following requests concurrently.')
+def step_impl(context):
+    # Each row needs the columns "request_type", "endpoint" (an ApiEndpoint name) and "status_code".
+    engine = async_requests.get_engine(context)
+    session_id = getattr(context, 'session_id', '')
+
+    requests_jobs = []
+
+    for row in context.table:
+        spec = request_spec.RequestSpec(row['request_type'], constants.ApiEndpoint[row['endpoint']].value)
+        requests_jobs.append(async_requests.snapshot_request(context, row['request_type'], int(row['status_code']),
+                                                             request_spec=spec.with_session_id(session_id)))
+
+    context.responses = engine.make_requests(requests_jobs)
+    context.response = context.responses[-1]
+
+
 @then(u'the request passes with the status code "{expected_code}".')
 def step_impl(context, expected_code):
     actual_code = context.response.status_code
@@ -34,6 +52,10 @@ def step_impl(context, session_key):
 # Scenario 2
 @given(u'the user has already visited the homepage of parabank.')
 def step_impl(context):
+
+    if session_cache.lease_session(context):
+        return
+
     context.execute_steps('''
         Given the user has a public endpoint to visit homepage of parabank.
         When the user makes the "GET" request to the endpoint.
@@ -53,12 +75,20 @@ def step_impl(context, status):
 
 @given(u'the user has a public endpoint to visit the registration page of Parabank.')
 def step_impl(context):
-    context.endpoint = constants.ApiEndpoint.register_customer_with_session_id_endpoint.value.format(context.session_id)
+    spec = request_spec.get_route_spec(constants.ApiEndpoint.register_customer_with_session_id_endpoint)
+
+    # The page of a session is only requested again by the scenarios sharing it through the session cache.
+    context.request_spec = spec.replace(endpoint=spec.endpoint.format(context.session_id), cacheable=True)
 
 
 # Scenario 4
 @given(u'the user has already visited the registration page of parabank with "{status}" JSESSIONID.')
 def step_impl(context, status):
+    token = session_cache.lease_session(context)
+
+    if token and token.registration_page_visited and status == 'a valid':
+        return
+
     context.execute_steps(f'''
         Given the user has already visited the homepage of parabank.
         And the user has "{status}" JSESSIONID as a token.
@@ -67,21 +97,27 @@ def step_impl(context, status):
         Then the request passes with the status code "200".
     ''')
 
+    if token and status == 'a valid':
+        token.registration_page_visited = True
+
 
 @given(u'the user has a public endpoint to register a customer account.')
 def step_impl(context):
-    context.endpoint = constants.ApiEndpoint.register_customer_endpoint.value
+    context.request_spec = request_spec.get_route_spec(constants.ApiEndpoint.register_customer_endpoint)
 
 
 @given(u'the user has a payload for account registration.')
 def step_impl(context):
-    context.headers = {"Content-Type": "application/x-www-form-urlencoded",
-                       "Cookie": f"JSESSIONID={context.session_id}"}
+    spec = context.request_spec.with_session_id(context.session_id)
+
+    if not spec.payload:
+        # Every registration gets a unique username, sent url-encoded to match the Content-Type of the route.
+        spec = spec.replace(payload=data_factory.get_factory(context).new_payload())
 
-    if not hasattr(context, 'payload'):
-        context.payload = copy.deepcopy(constants.ApiConstant.register_customer_payload.value)
+    context.request_spec = spec
 
-    context.registration_payload = copy.deepcopy(context.payload)    # Storing as a reference for later steps.
+    # Storing as a reference for later steps, the payload is never changed in place once it is sent.
+    context.registration_payload = spec.payload
 
 
 @then(u'the customer account is registered successfully.')
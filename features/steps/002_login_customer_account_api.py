@@ -3,7 +3,7 @@ from urllib.parse import quote
 
 from behave import given, then
 
-from steps import utils, constants
+from steps import request_spec, utils, constants
 
 logger = logging.getLogger('myLogger')
 
@@ -11,14 +11,11 @@ logger = logging.getLogger('myLogger')
 # Scenario 1
 @given(u'the user has a public endpoint to login into the customer account.')
 def step_impl(context):
-    context.endpoint = constants.ApiEndpoint.login_endpoint.value
+    context.request_spec = request_spec.get_route_spec(constants.ApiEndpoint.login_endpoint)
 
 
 @given(u'the user has "{status}" credentials to login into the customer account.')
 def step_impl(context, status):
-    context.allow_redirects = False
-    context.headers = {"Content-Type": "application/x-www-form-urlencoded",
-                       "Cookie": f"JSESSIONID={context.session_id}"}
 
     if status == 'valid':
         utils.has_context_attr(context, 'registration_payload')
@@ -28,7 +25,8 @@ def step_impl(context, status):
     else:
         username = password = 'invalid'
 
-    context.payload = f'username={quote(username)}&password={quote(password)}'
+    context.request_spec = context.request_spec.with_session_id(context.session_id).replace(
+        payload=f'username={quote(username)}&password={quote(password)}')
 
 
 @then(u'the user can see the message "{expected_text}".')
@@ -38,7 +36,7 @@ def step_impl(context, expected_text):
 
 
 # Scenario 3
-@given(u'the user has already logged into the customer account using "valid" credentials.')
+@given(u'the user has already logged into the customer account using valid credentials.')
 def step_impl(context):
     context.execute_steps('''
         Given the user has a public endpoint to login into the customer account.
@@ -50,10 +48,18 @@ def step_impl(context):
 
 @given(u'the user has a private endpoint to visit the dashboard overview of parabank.')
 def step_step(context):
-    context.endpoint = constants.ApiEndpoint.overview_endpoint.value
+    spec = request_spec.get_route_spec(constants.ApiEndpoint.overview_endpoint)
+    context.request_spec = spec.with_session_id(context.session_id)
 
 
 # Scenario 4
 @given(u'the user has a private endpoint to logout of the customer account of parabank.')
 def step_impl(context):
-    context.endpoint = constants.ApiEndpoint.login_endpoint.value
+    spec = request_spec.get_route_spec(constants.ApiEndpoint.login_endpoint)
+    context.request_spec = spec.with_session_id(context.session_id)
+
+
+@then(u'the user is logged out of the customer account of parabank.')
+def step_impl(context):
+    # This step is just for better readability.
+    pass
@@ -2,7 +2,7 @@ import logging
 
 from behave import given, when, then
 
-from steps import utils, constants
+from steps import utils, constants, locators, session_handoff
 
 logger = logging.getLogger('myLogger')
 
@@ -27,7 +27,7 @@ def step_impl(context, page_name):
 
 @then(u'the user can see a message "{msg}".')
 def step_impl(context, msg):
-    utils.locate_elem_by_text(context, msg)
+    utils.assert_text_visible(context, msg)
 
 
 # Scenario 2
@@ -43,11 +43,30 @@ def step_impl(context):
 
 @when(u'the user enters "{field_value}" in the "{field_name}" field.')
 def step_impl(context, field_value, field_name):
-    specific_field_xpath = constants.FrontEndXpath.field_xpath.value.format(field_name)
+    specific_field_xpath = locators.format_xpath(constants.FrontEndXpath.field_xpath.value, field_name)
     utils.send_keys_to_elem(context, field_value, specific_field_xpath)
 
 
+@when(u'the user fills in the form with the following details.')
+def step_impl(context):
+    # Each row needs the columns "field" (the label of the field) and "value".
+    utils.fill_form(context, {row['field']: row['value'] for row in context.table})
+
+
 @when(u'the user submits the form by clicking on the Register button.')
 def step_impl(context):
     registration_btn_xpath = constants.FrontEndXpath.registration_btn_xpath.value
     utils.click_elem(context, registration_btn_xpath)
+
+
+# Scenario 3
+@given(u'a new customer registered through the API is on the accounts overview page of Parabank.')
+def step_impl(context):
+    # Registering through the UI is covered by scenario 100.2, here the session is handed over to the browser.
+    session_handoff.register_in_browser(context, constants.FrontEndURL.overview_url.value)
+
+
+# Scenario 4
+@given(u'the customer logged in through the API is on the accounts overview page of Parabank.')
+def step_impl(context):
+    session_handoff.login_in_browser(context, constants.FrontEndURL.overview_url.value)
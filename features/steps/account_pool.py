@@ -0,0 +1,264 @@
+import json
+import logging
+import os
+import threading
+
+from steps import async_requests, constants, data_factory, payload_templates, request_spec, utils
+
+logger = logging.getLogger('myLogger')
+
+SESSION_KEY = 'JSESSIONID'
+REGISTRATION_SUCCESS_TEXT = 'Your account was created successfully.'
+
+
+class AccountPool:
+    """This class keeps registered customer accounts ready to be leased by the scenarios.
+
+    Args:
+        register_account (Callable): The function that registers a new account and returns its registration payload.
+        engine (AsyncRequestEngine): The engine used to register many accounts concurrently.
+        size (int): The number of available accounts to keep in the pool.
+        min_size (int): The number of available accounts below which the pool is refilled in the background.
+        manifest_path (str): The JSON file the accounts are persisted in between runs, empty to not persist them.
+        server (str): The server the accounts are registered on.
+    """
+
+    def __init__(self, register_account, engine, size=10, min_size=3, manifest_path='', server=''):
+        self.register_account = register_account
+        self.engine = engine
+        self.size = size
+        self.min_size = min_size
+        self.manifest_path = manifest_path
+        self.server = server
+
+        self._condition = threading.Condition()
+        self._manifest_lock = threading.Lock()
+        self._available = self.load_manifest()
+        self._leased = []
+        self._refilling = False
+
+    def load_manifest(self):
+
+        if not self.manifest_path or not os.path.isfile(self.manifest_path):
+            return []
+
+        with open(self.manifest_path) as manifest_file:
+            manifest = json.load(manifest_file)
+
+        accounts = manifest.get(self.server, [])
+        logger.debug(f'Loaded {len(accounts)} accounts for "{self.server}" from "{self.manifest_path}".')
+
+        return accounts
+
+    def save_manifest(self):
+
+        if not self.manifest_path:
+            return
+
+        with self._manifest_lock:
+            manifest = {}
+
+            if os.path.isfile(self.manifest_path):
+                with open(self.manifest_path) as manifest_file:
+                    manifest = json.load(manifest_file)
+
+            with self._condition:
+                manifest[self.server] = self._available + self._leased
+
+            os.makedirs(os.path.dirname(self.manifest_path) or '.', exist_ok=True)
+
+            with open(self.manifest_path, 'w') as manifest_file:
+                json.dump(manifest, manifest_file, indent=1)
+
+    def refill(self):
+        """This function registers the missing accounts concurrently in the background."""
+
+        with self._condition:
+            missing = self.size - len(self._available)
+
+            if self._refilling or missing <= 0:
+                return
+
+            self._refilling = True
+
+        threading.Thread(target=self._register_accounts, args=(missing,), name='account-pool-refill',
+                         daemon=True).start()
+
+    def _register_accounts(self, count):
+        results = self.engine.run([self.register_account] * count)
+        accounts = [result for result in results if not isinstance(result, BaseException)]
+
+        for error in (result for result in results if isinstance(result, BaseException)):
+            logger.debug(f'Unable to register an account for the pool: {error}')
+
+        with self._condition:
+            self._available.extend(accounts)
+            self._refilling = False
+            self._condition.notify_all()
+
+        logger.debug(f'Registered {len(accounts)} of {count} accounts for the account pool.')
+
+        self.save_manifest()
+
+    def lease(self, _timeout=30):
+        """This function hands out an available account and refills the pool when it runs low.
+
+        Args:
+            _timeout (int): The time in seconds to wait for the refill before registering an account directly.
+
+        Returns:
+            account (dict): The registration payload of the leased account.
+        """
+
+        with self._condition:
+
+            if not self._available:
+                self._condition.wait_for(lambda: self._available or not self._refilling, timeout=_timeout)
+
+            account = self._available.pop(0) if self._available else None
+
+        if account is None:
+            account = self.register_account()
+
+        with self._condition:
+            self._leased.append(account)
+            running_low = len(self._available) < self.min_size
+
+        if running_low:
+            self.refill()
+
+        return account
+
+    def release(self, account):
+
+        with self._condition:
+
+            if account in self._leased:
+                self._leased.remove(account)
+
+            self._available.append(account)
+            self._condition.notify_all()
+
+
+def get_session_cookie(response):
+    """This function returns the JSESSIONID cookie the server set with a response.
+
+    Args:
+        response (Response): The response that started the session.
+
+    Raises:
+        AssertionError: An exception arises if the response did not set a JSESSIONID.
+
+    Returns:
+        cookie (Cookie): The cookie along with the path, domain and flags the server set it with.
+    """
+
+    for cookie in response.cookies:
+
+        if cookie.name == SESSION_KEY:
+            return cookie
+
+    raise AssertionError(f'The server did not set a "{SESSION_KEY}" cookie.')
+
+
+def register_session(config, payload):
+    """This function registers a customer account through the same request pipeline as the steps.
+
+    Args:
+        config (Configuration): The behave configuration holding the server.
+        payload (dict): The registration payload of the account.
+
+    Raises:
+        AssertionError: An exception arises if any of the following situations occur:
+                        1) if any of the requests fails.
+                        2) if the server did not set a JSESSIONID.
+                        3) if the server did not confirm the registration.
+
+    Returns:
+        session_cookie (Cookie): The JSESSIONID cookie the account was registered with, the customer is logged in on it.
+    """
+
+    homepage_job = request_spec.get_route_spec(constants.ApiEndpoint.homepage_endpoint).to_job(config)
+    utils.make_request(homepage_job, 'GET', 200)
+    session_cookie = get_session_cookie(homepage_job.response)
+    session_id = session_cookie.value
+
+    registration_page_spec = request_spec.get_route_spec(
+        constants.ApiEndpoint.register_customer_with_session_id_endpoint)
+    utils.make_request(registration_page_spec.with_session_id(session_id).to_job(config), 'GET', 200)
+
+    registration_spec = request_spec.get_route_spec(constants.ApiEndpoint.register_customer_endpoint)
+    registration_job = registration_spec.with_session_id(session_id).replace(payload=payload).to_job(config)
+    utils.make_request(registration_job, 'POST', 200)
+
+    utils.assert_text_contains(REGISTRATION_SUCCESS_TEXT, registration_job.response.text, 'Registration Response')
+
+    return session_cookie
+
+
+def register_account(config, payload):
+    """This function registers a customer account, see register_session.
+
+    Args:
+        config (Configuration): The behave configuration holding the server.
+        payload (dict): The registration payload of the account.
+
+    Returns:
+        payload (dict): The registration payload of the registered account.
+    """
+
+    register_session(config, payload)
+
+    # The pool persists its accounts as JSON, so they are kept as plain dicts.
+    return payload_templates.flatten(payload)
+
+
+_state = {'pool': None}
+
+
+def configure(context):
+    """This function starts filling the account pool if it is enabled in behave.ini.
+
+    Args:
+        context (Context): The default object is available throughout Behave framework.
+    """
+
+    if str(utils.get_value_from_ini(context, utils.ConfigVars.account_pool.value, 'false')).lower() != 'true':
+        return
+
+    config = context.config
+    factory = data_factory.get_factory(context)
+
+    # Accounts on the in-process stand-in server are gone after the run, so they are not persisted.
+    manifest_path = '' if hasattr(context, 'stub_server') else \
+        utils.get_value_from_ini(context, utils.ConfigVars.account_pool_manifest.value, '../.cache/account_pool.json')
+
+    pool = AccountPool(lambda: register_account(config, factory.new_payload()),
+                       async_requests.get_engine(context),
+                       int(utils.get_value_from_ini(context, utils.ConfigVars.account_pool_size.value, 10)),
+                       int(utils.get_value_from_ini(context, utils.ConfigVars.account_pool_min_size.value, 3)),
+                       manifest_path,
+                       utils.get_value_from_ini(context, utils.ConfigVars.server.value))
+    pool.refill()
+
+    _state['pool'] = pool
+
+    logger.debug('--- Started the account pool. ---')
+
+
+def get_pool():
+    return _state['pool']
+
+
+def close():
+    """This function persists the accounts of the pool for the next run."""
+
+    pool = _state['pool']
+
+    if pool is None:
+        return
+
+    pool.save_manifest()
+    _state['pool'] = None
+
+    logger.debug('< Saved the account pool.')
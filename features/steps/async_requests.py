@@ -0,0 +1,138 @@
+import asyncio
+import copy
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+from steps import utils
+
+logger = logging.getLogger('myLogger')
+
+# Attributes of the context that make up a request in the make_request pipeline.
+REQUEST_ATTRS = ('request_spec', 'session_id', 'scenario_deadline')
+
+
+def snapshot_request(context, _request_type='GET', _status_code=0, **overrides):
+    """This function copies the request attributes of the context into an independent request job.
+
+    Args:
+        context (Context): The default object is available throughout Behave framework.
+        _request_type (str): CRUD operation being used while making the request.
+        _status_code (int): Expected status code after making the request.
+        overrides (dict): The request attributes to replace in the snapshot. i.e. request_spec=spec
+
+    Returns:
+        job (SimpleNamespace): The request job that can be passed to utils.make_request in place of the context.
+    """
+
+    job = SimpleNamespace(config=context.config, request_type=_request_type, status_code=_status_code)
+
+    for attr in REQUEST_ATTRS:
+
+        if hasattr(context, attr):
+            setattr(job, attr, copy.copy(getattr(context, attr)))
+
+    for attr, value in overrides.items():
+        setattr(job, attr, value)
+
+    return job
+
+
+class AsyncRequestEngine:
+    """This class runs blocking request jobs concurrently on one event loop with a concurrency cap.
+
+    Every job runs on a worker thread of the engine, so each one uses the pooled session of its own thread.
+    The number of worker threads is the concurrency cap. They are kept between runs to keep their connections warm.
+    """
+
+    def __init__(self, concurrency=10):
+        self.concurrency = max(1, int(concurrency))
+        self.executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='async-request')
+
+    async def _run_jobs(self, jobs):
+        loop = asyncio.get_running_loop()
+
+        # Jobs beyond the concurrency cap wait in the queue of the executor.
+        tasks = [loop.run_in_executor(self.executor, job) for job in jobs]
+
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    def run(self, jobs):
+        """This function runs the callables concurrently and waits for all of them to finish.
+
+        Args:
+            jobs (list): The callables without arguments to run.
+
+        Returns:
+            results (list): The return value or the raised exception of every job, in the order of the jobs.
+        """
+
+        loop = asyncio.new_event_loop()
+
+        try:
+            return loop.run_until_complete(self._run_jobs(jobs))
+        finally:
+            loop.close()
+
+    def make_requests(self, requests_jobs):
+        """This function makes the requests of all the request jobs concurrently through utils.make_request.
+
+        Args:
+            requests_jobs (list): The request jobs created with snapshot_request.
+
+        Raises:
+            AssertionError: An exception arises if any of the following situations occur:
+                            1) if any of the requests failed or had an unexpected status code.
+
+        Returns:
+            responses (list): The responses in the order of the request jobs.
+        """
+
+        def make_request_job(request_job):
+            return lambda: utils.make_request(request_job, request_job.request_type, request_job.status_code)
+
+        results = self.run([make_request_job(request_job) for request_job in requests_jobs])
+
+        errors = [f'{request_job.request_spec.endpoint}: {result}' for request_job, result in zip(requests_jobs, results)
+                  if isinstance(result, BaseException)]
+
+        if errors:
+            raise AssertionError(f'{len(errors)} of {len(requests_jobs)} concurrent requests failed:\n' +
+                                 '\n'.join(errors))
+
+        logger.debug(f'Completed {len(requests_jobs)} concurrent requests.')
+
+        return [request_job.response for request_job in requests_jobs]
+
+    def close(self):
+        """This function stops the worker threads of the engine."""
+
+        self.executor.shutdown(wait=True)
+
+
+_engines = {}
+
+
+def get_engine(context):
+    """This function returns the shared asynchronous request engine with the concurrency cap from behave.ini.
+
+    Args:
+        context (Context): The default object is available throughout Behave framework.
+
+    Returns:
+        engine (AsyncRequestEngine): The engine to run request jobs concurrently.
+    """
+
+    concurrency = int(utils.get_value_from_ini(context, utils.ConfigVars.async_concurrency.value, 10))
+
+    if concurrency not in _engines:
+        _engines[concurrency] = AsyncRequestEngine(concurrency)
+
+    return _engines[concurrency]
+
+
+def close_engines():
+    """This function stops the worker threads of every shared engine."""
+
+    while _engines:
+        _engines.popitem()[1].close()
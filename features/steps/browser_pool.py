@@ -0,0 +1,284 @@
+import logging
+import threading
+
+import selenium.common.exceptions as exceptions
+
+from steps import browser_profiles, dom_snapshot, ui_settle
+
+logger = logging.getLogger('myLogger')
+
+WINDOW_SIZE = (1920, 1080)
+
+
+class PooledBrowser:
+    """This class is a warm WebDriver session along with the number of scenarios it has served."""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.uses = 0
+
+
+class BrowserPool:
+    """This class keeps WebDriver sessions warm between the scenarios instead of launching a browser for each one.
+
+    Args:
+        create_browser (Callable): The function that launches a new WebDriver session.
+        size (int): The number of idle sessions to keep warm.
+        max_uses (int): The number of scenarios after which a session is replaced by a new one, 0 to never replace it.
+        max_browsers (int): The number of sessions running at once, launching, idle or leased. 0 for size + 1, i.e.
+                            the idle sessions along with the one leased by the running scenario.
+    """
+
+    def __init__(self, create_browser, size=1, max_uses=20, max_browsers=0):
+        self.create_browser = create_browser
+        self.size = max(1, size)
+        self.max_uses = max_uses
+        self.max_browsers = max_browsers if max_browsers > 0 else self.size + 1
+
+        self.launches = 0
+        self.leases = 0
+
+        self._idle = []
+        self._leased = {}
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+        self._launching = 0
+        self._live = 0
+        self._closed = False
+
+    def launch(self):
+        browser = PooledBrowser(self.create_browser())
+
+        with self._lock:
+            self.launches += 1
+
+        return browser
+
+    def warm_up(self):
+        """This function launches the missing idle sessions in the background."""
+
+        with self._lock:
+            missing = 0 if self._closed else min(self.size - len(self._idle) - self._launching,
+                                                 self.max_browsers - self._live)
+            missing = max(0, missing)
+            self._launching += missing
+            self._live += missing
+
+        for _ in range(missing):
+            threading.Thread(target=self._launch_idle, name='browser-pool-warm-up', daemon=True).start()
+
+    def _launch_idle(self):
+
+        try:
+            browser = self.launch()
+        except Exception as error:
+            logger.debug(f'Unable to warm up a browser for the browser pool: {error}')
+            browser = None
+
+        with self._available:
+            self._launching -= 1
+            closed = self._closed
+
+            if browser is None:
+                self._live -= 1
+            elif not closed:
+                self._idle.append(browser)
+
+            self._available.notify()
+
+        # A browser launched while the pool was closing is not left running.
+        if browser is not None and closed:
+            self.discard(browser.driver)
+
+    def discard(self, driver):
+        """This function quits a browser of the pool, which makes room for another one to launch.
+
+        Args:
+            driver (WebDriver): The browser to quit.
+        """
+
+        quit_browser(driver)
+
+        with self._available:
+            self._live -= 1
+            self._available.notify()
+
+    def is_healthy(self, browser):
+
+        try:
+            browser.driver.execute_script('return document.readyState;')
+            return True
+        except exceptions.WebDriverException as error:
+            logger.debug(f'Dropping an unresponsive browser from the browser pool: {error.msg}')
+            return False
+
+    def lease(self):
+        """This function hands out a healthy warm session, or launches one if none is ready.
+
+        Once max_browsers are running, the lease waits for a session to be released or to finish launching.
+
+        Returns:
+            driver (WebDriver): The browser leased to the scenario until it is released.
+        """
+
+        browser = None
+
+        while browser is None:
+
+            with self._available:
+
+                while not self._idle and self._live >= self.max_browsers:
+                    self._available.wait()
+
+                if self._idle:
+                    browser = self._idle.pop()
+                else:
+                    self._live += 1
+
+            if browser is None:
+
+                try:
+                    browser = self.launch()
+                except BaseException:
+                    with self._available:
+                        self._live -= 1
+                        self._available.notify()
+
+                    raise
+            elif not self.is_healthy(browser):
+                self.discard(browser.driver)
+                browser = None
+
+        browser.uses += 1
+
+        with self._lock:
+            self._leased[id(browser.driver)] = browser
+            self.leases += 1
+
+        return browser.driver
+
+    def release(self, driver):
+        """This function resets the session for the next scenario, or replaces it once it has served max_uses.
+
+        Args:
+            driver (WebDriver): The browser leased from the pool.
+        """
+
+        with self._lock:
+            browser = self._leased.pop(id(driver), None)
+
+        if browser is None:
+            quit_browser(driver)
+            return
+
+        if (self.max_uses and browser.uses >= self.max_uses) or not reset_browser(driver):
+            self.discard(driver)
+        else:
+            with self._available:
+                self._idle.append(browser)
+                self._available.notify()
+
+        self.warm_up()
+
+    def close(self):
+
+        with self._lock:
+            browsers = self._idle + list(self._leased.values())
+            self._idle = []
+            self._leased = {}
+            self._live -= len(browsers)
+            self._closed = True
+
+        for browser in browsers:
+            quit_browser(browser.driver)
+
+
+def reset_browser(driver):
+    """This function removes everything a scenario left behind in the browser.
+
+    Args:
+        driver (WebDriver): The browser to reset.
+
+    Returns:
+        reset (bool): Whether the browser could be reset, a browser that could not be reset should not be reused.
+    """
+
+    try:
+        window_handles = driver.window_handles
+
+        for window_handle in window_handles[1:]:
+            driver.switch_to.window(window_handle)
+            driver.close()
+
+        driver.switch_to.window(window_handles[0])
+        origin = driver.execute_script('return window.location.origin;')
+
+        try:
+            # DevTools clears the cookies of every site, not just the ones of the current page.
+            driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+
+            if origin and origin.startswith('http'):
+                driver.execute_cdp_cmd('Storage.clearDataForOrigin', {'origin': origin, 'storageTypes': 'all'})
+        except (AttributeError, exceptions.WebDriverException):
+            driver.delete_all_cookies()
+
+            if origin and origin.startswith('http'):
+                driver.execute_script('window.localStorage.clear(); window.sessionStorage.clear();')
+
+        driver.get('about:blank')
+        driver.set_window_size(*WINDOW_SIZE)
+
+        return True
+    except exceptions.WebDriverException as error:
+        logger.debug(f'Unable to reset the browser: {error.msg}')
+        return False
+
+
+def quit_browser(driver):
+
+    try:
+        driver.quit()
+    except exceptions.WebDriverException as error:
+        logger.debug(f'Unable to quit the browser: {error.msg}')
+
+    browser_profiles.release(driver)
+    ui_settle.forget(driver)
+    dom_snapshot.invalidate(driver)
+
+
+_state = {'pool': None}
+
+
+def get_pool(context, create_browser):
+    """This function returns the browser pool of the run and creates it on the first call.
+
+    Args:
+        context (Context): The default object is available throughout Behave framework.
+        create_browser (Callable): The function that launches a new WebDriver session.
+
+    Returns:
+        pool (BrowserPool): The browser pool configured in behave.ini.
+    """
+
+    if _state['pool'] is None:
+        userdata = context.config.userdata
+
+        _state['pool'] = BrowserPool(create_browser, int(userdata.get('BROWSER_POOL_SIZE', 1)),
+                                     int(userdata.get('BROWSER_MAX_USES', 20)),
+                                     int(userdata.get('BROWSER_POOL_MAX', 0)))
+
+    return _state['pool']
+
+
+def close():
+    """This function quits every browser of the pool."""
+
+    pool = _state['pool']
+
+    if pool is None:
+        return
+
+    pool.close()
+    _state['pool'] = None
+
+    logger.debug(f'< Closed the browser pool | Leases: {pool.leases} | Launches: {pool.launches}')
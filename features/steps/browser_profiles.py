@@ -0,0 +1,199 @@
+import json
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+
+logger = logging.getLogger('myLogger')
+
+# Bump to rebuild the templates prepared by earlier runs.
+TEMPLATE_VERSION = 1
+
+# Chrome switches that skip the work a fresh profile does on its first launch.
+CHROME_ARGUMENTS = (
+    '--no-first-run',
+    '--no-default-browser-check',
+    '--disable-extensions',
+    '--disable-component-update',
+    '--disable-background-networking',
+    '--disable-sync',
+)
+
+TEMPLATE_PREFERENCES = {
+    'browser': {'has_seen_welcome_page': True, 'check_default_browser': False},
+    'credentials_enable_service': False,
+    'download': {'default_directory': '/downloads', 'prompt_for_download': False},
+    'profile': {'password_manager_enabled': False},
+}
+
+# Files of a running Chrome that must not be carried over to a clone.
+LOCK_FILES = ('SingletonLock', 'SingletonCookie', 'SingletonSocket', 'lockfile')
+
+_state = {'root': None, 'template_ready': False}
+_clones = {}
+_lock = threading.Lock()
+
+
+def get_template_dir(root):
+    return os.path.join(root, 'template')
+
+
+def get_marker_path(root):
+    return os.path.join(root, 'template.json')
+
+
+def is_template_current(root, _warm_up_url=''):
+
+    try:
+        with open(get_marker_path(root)) as file:
+            marker = json.load(file)
+    except (OSError, ValueError):
+        return False
+
+    return marker.get('version') == TEMPLATE_VERSION and marker.get('warm_up_url', '') == _warm_up_url
+
+
+def prepare_template(root, launch_browser, _warm_up_url=''):
+    """This function creates the template profile, and loads the page once so the HTTP cache of Chrome holds its assets.
+
+    The marker of the template is only written once it is complete, a template whose warm-up failed is used for this
+    run and prepared again by the next one.
+
+    Args:
+        root (str): The directory of the template and its clones.
+        launch_browser (Callable): The function that launches Chrome with the given user data directory.
+        _warm_up_url (str): The page whose static assets are cached in the template, none if empty.
+    """
+
+    # A marker left by an earlier template must not outlive it.
+    if os.path.exists(get_marker_path(root)):
+        os.remove(get_marker_path(root))
+
+    template_dir = get_template_dir(root)
+    shutil.rmtree(template_dir, ignore_errors=True)
+    os.makedirs(os.path.join(template_dir, 'Default'))
+
+    # Chrome skips its first run experience for a profile holding these files.
+    open(os.path.join(template_dir, 'First Run'), 'w').close()
+
+    with open(os.path.join(template_dir, 'Default', 'Preferences'), 'w') as file:
+        json.dump(TEMPLATE_PREFERENCES, file)
+
+    if _warm_up_url:
+
+        try:
+            browser = launch_browser(template_dir)
+
+            try:
+                browser.get(_warm_up_url)
+            finally:
+                browser.quit()
+        except Exception as error:
+            logger.debug(f'Unable to warm up the template profile, it is used without cached assets: {error}')
+            return
+
+    with open(get_marker_path(root), 'w') as file:
+        json.dump({'version': TEMPLATE_VERSION, 'warm_up_url': _warm_up_url}, file)
+
+    logger.debug(f'--- Prepared the template browser profile in {template_dir} ---')
+
+
+def copy_profile(source, destination):
+    """This function copies a profile, sharing the blocks of the files on file systems that support reflinks.
+
+    Hardlinks are not used since Chrome rewrites the files of its profile in place, which would change the template.
+
+    Args:
+        source (str): The template profile.
+        destination (str): The empty directory of the clone.
+    """
+
+    if sys.platform.startswith('linux'):
+        result = subprocess.run(['cp', '-a', '--reflink=auto', f'{source}/.', destination], capture_output=True)
+
+        if result.returncode == 0:
+            return
+
+        logger.debug(f'Unable to reflink the template profile: {result.stderr.decode(errors="replace").strip()}')
+
+    shutil.copytree(source, destination, dirs_exist_ok=True, ignore=shutil.ignore_patterns(*LOCK_FILES))
+
+
+def get_profile(context, launch_browser, _warm_up_url=''):
+    """This function returns a new clone of the template profile, preparing the template on the first call.
+
+    Args:
+        context (Context): The default object is available throughout Behave framework.
+        launch_browser (Callable): The function that launches Chrome with the given user data directory.
+        _warm_up_url (str): The page whose static assets are cached in the template, none if empty.
+
+    Returns:
+        profile_dir (str): The user data directory for a new browser, None if the profile cache is disabled.
+    """
+
+    userdata = context.config.userdata
+
+    if str(userdata.get('CHROME_PROFILE_CACHE', 'false')).lower() != 'true':
+        return None
+
+    with _lock:
+
+        if not _state['template_ready']:
+            root = os.path.abspath(userdata.get('CHROME_PROFILE_DIR', '../.cache/chrome_profile'))
+            os.makedirs(os.path.join(root, 'clones'), exist_ok=True)
+
+            if not is_template_current(root, _warm_up_url):
+                prepare_template(root, launch_browser, _warm_up_url)
+
+            _state['root'] = root
+            _state['template_ready'] = True
+
+    profile_dir = tempfile.mkdtemp(prefix='profile-', dir=os.path.join(_state['root'], 'clones'))
+    copy_profile(get_template_dir(_state['root']), profile_dir)
+
+    for lock_file in LOCK_FILES:
+
+        if os.path.lexists(os.path.join(profile_dir, lock_file)):
+            os.remove(os.path.join(profile_dir, lock_file))
+
+    return profile_dir
+
+
+def track(driver, profile_dir):
+    """This function remembers the clone of a browser so that it is removed once the browser quits."""
+
+    if profile_dir is not None:
+        _clones[id(driver)] = profile_dir
+
+
+def remove_profile(profile_dir):
+
+    if profile_dir is not None:
+        shutil.rmtree(profile_dir, ignore_errors=True)
+
+
+def release(driver):
+    """This function removes the clone of a browser that has quit.
+
+    Args:
+        driver (WebDriver): The browser that has quit.
+    """
+
+    remove_profile(_clones.pop(id(driver), None))
+
+
+def close():
+    """This function removes the clones left behind, the template is kept for the next run."""
+
+    for profile_dir in list(_clones.values()):
+        remove_profile(profile_dir)
+
+    _clones.clear()
+
+    if _state['root'] is not None:
+        shutil.rmtree(os.path.join(_state['root'], 'clones'), ignore_errors=True)
+        _state['root'] = None
+        _state['template_ready'] = False
@@ -0,0 +1,272 @@
+import datetime
+import hashlib
+import json
+import logging
+import mmap
+import os
+import threading
+
+import requests
+from requests.cookies import cookiejar_from_dict
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+logger = logging.getLogger('myLogger')
+
+PASSTHROUGH_MODE = 'passthrough'
+RECORD_MODE = 'record'
+REPLAY_MODE = 'replay'
+
+INDEX_FILE_NAME = 'index.json'
+BODIES_FILE_NAME = 'bodies.bin'
+
+# The entry of the index holding the settings of the recording run instead of responses, never a fingerprint.
+METADATA_KEY = '_recording'
+
+# Headers that change on every run without changing the meaning of the request.
+VOLATILE_HEADERS = ('user-agent', 'content-length', 'accept-encoding', 'connection')
+
+
+class CassetteResponse(requests.Response):
+    """This class is a recorded response whose body is only read from the cassette when it is accessed."""
+
+    def __init__(self, store, entry):
+        super().__init__()
+
+        self._store = store
+        self._entry = entry
+
+        self.url = entry['url']
+        self.status_code = entry['status_code']
+        self.reason = entry['reason']
+        self.headers = CaseInsensitiveDict(entry['headers'])
+        self.encoding = get_encoding_from_headers(self.headers)
+        self.cookies = cookiejar_from_dict(entry['cookies'])
+        self.elapsed = datetime.timedelta(0)
+
+    @property
+    def content(self):
+
+        if self._content is False:
+            self._content = self._store.read_body(self._entry['offset'], self._entry['length'])
+            self._content_consumed = True
+
+        return self._content
+
+
+class CassetteStore:
+    """This class keeps the recorded responses on disk, indexed by the fingerprint of their requests.
+
+    The index holds the status, headers and cookies of every response while the bodies are appended to a single
+    file which is memory-mapped on the first body read, so a big cassette costs nothing until it is replayed.
+    """
+
+    def __init__(self, cassette_dir, _fresh=False):
+        self.cassette_dir = cassette_dir
+        self.index_path = os.path.join(cassette_dir, INDEX_FILE_NAME)
+        self.bodies_path = os.path.join(cassette_dir, BODIES_FILE_NAME)
+
+        self._lock = threading.Lock()
+        self._bodies = None
+        self._replay_counts = {}
+
+        if _fresh and os.path.isfile(self.bodies_path):
+            # A new recording replaces the previous cassette.
+            os.remove(self.bodies_path)
+
+        if not _fresh and os.path.isfile(self.index_path):
+            with open(self.index_path) as index_file:
+                self.index = json.load(index_file)
+        else:
+            self.index = {}
+
+        self.metadata = self.index.pop(METADATA_KEY, {})
+
+    def read_body(self, offset, length):
+
+        if not length:
+            return b''
+
+        with self._lock:
+
+            if self._bodies is None:
+                with open(self.bodies_path, 'rb') as bodies_file:
+                    self._bodies = mmap.mmap(bodies_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        return self._bodies[offset:offset + length]
+
+    def record(self, fingerprint, response):
+        body = response.content
+
+        entry = {
+            'url': response.url,
+            'status_code': response.status_code,
+            'reason': response.reason,
+            'headers': dict(response.headers),
+            'cookies': response.cookies.get_dict(),
+            'length': len(body),
+        }
+
+        with self._lock:
+            os.makedirs(self.cassette_dir, exist_ok=True)
+
+            with open(self.bodies_path, 'ab') as bodies_file:
+                entry['offset'] = bodies_file.tell()
+                bodies_file.write(body)
+
+            self.index.setdefault(fingerprint, []).append(entry)
+
+    def replay(self, fingerprint):
+
+        with self._lock:
+            entries = self.index.get(fingerprint)
+
+            if not entries:
+                return None
+
+            # Identical requests are served in the recorded order, the last response is repeated afterwards.
+            count = self._replay_counts.get(fingerprint, 0)
+            self._replay_counts[fingerprint] = count + 1
+
+            entry = entries[min(count, len(entries) - 1)]
+
+        return CassetteResponse(self, entry)
+
+    def save(self):
+
+        with self._lock:
+            os.makedirs(self.cassette_dir, exist_ok=True)
+
+            with open(self.index_path, 'w') as index_file:
+                json.dump({METADATA_KEY: self.metadata, **self.index}, index_file, indent=1)
+
+    def close(self):
+
+        with self._lock:
+
+            if self._bodies is not None:
+                self._bodies.close()
+                self._bodies = None
+
+
+_state = {'mode': PASSTHROUGH_MODE, 'store': None}
+
+
+def configure(mode, cassette_dir):
+    """This function selects the cassette mode for all the requests made through utils.make_request.
+
+    Args:
+        mode (str): One of "record", "replay" or "passthrough".
+        cassette_dir (str): The directory where the cassette is stored.
+
+    Raises:
+        AssertionError: An exception arises if any of the following situations occur:
+                        1) if the mode is unknown.
+    """
+
+    mode = (mode or PASSTHROUGH_MODE).lower()
+
+    if mode not in (PASSTHROUGH_MODE, RECORD_MODE, REPLAY_MODE):
+        raise AssertionError(f'Unknown http_mode "{mode}". Available modes are: record, replay, passthrough.')
+
+    _state['mode'] = mode
+    _state['store'] = CassetteStore(cassette_dir, mode == RECORD_MODE) if mode != PASSTHROUGH_MODE else None
+
+    logger.debug(f'HTTP mode is "{mode}".')
+
+
+def get_mode():
+    return _state['mode']
+
+
+def get_data_seed():
+    """This function returns the test data seed the cassette was recorded with.
+
+    Returns:
+        data_seed (int): The seed of the recording, None if not replaying or the cassette has no seed.
+    """
+
+    if _state['mode'] != REPLAY_MODE:
+        return None
+
+    return _state['store'].metadata.get('data_seed')
+
+
+def set_data_seed(data_seed):
+    """This function stores the test data seed in a recording cassette, so that replaying generates the same data.
+
+    Args:
+        data_seed (int): The seed of the test data of the run.
+    """
+
+    if _state['mode'] == RECORD_MODE:
+        _state['store'].metadata['data_seed'] = data_seed
+
+
+def fingerprint_request(request_type, endpoint, headers, payload, files):
+    """This function creates a stable fingerprint of the request to look it up in the cassette.
+
+    Args:
+        request_type (str): CRUD operation being used while making the request.
+        endpoint (str): The endpoint of the request without the server.
+        headers (dict): The headers of the request.
+        payload (Any): The payload of the request.
+        files (Any): The files of the request.
+
+    Returns:
+        fingerprint (str): The sha256 hex digest of the normalized request.
+    """
+
+    normalized_headers = sorted((str(key).lower().strip(), str(value).strip()) for key, value in (headers or {}).items()
+                                if str(key).lower().strip() not in VOLATILE_HEADERS)
+
+    normalized_request = json.dumps([request_type.upper(), endpoint, normalized_headers, str(payload or ''),
+                                     str(files or '')])
+
+    return hashlib.sha256(normalized_request.encode('utf-8')).hexdigest()
+
+
+def record(fingerprint, response):
+    _state['store'].record(fingerprint, response)
+
+
+def replay(fingerprint, request_type, endpoint):
+    """This function returns the recorded response of the request.
+
+    Args:
+        fingerprint (str): The fingerprint of the request.
+        request_type (str): CRUD operation being used while making the request.
+        endpoint (str): The endpoint of the request.
+
+    Raises:
+        AssertionError: An exception arises if any of the following situations occur:
+                        1) if the request was never recorded.
+
+    Returns:
+        response (CassetteResponse): The recorded response.
+    """
+
+    response = _state['store'].replay(fingerprint)
+
+    if response is None:
+        raise AssertionError(f'No recorded response in the cassette for "{request_type}" request to "{endpoint}". '
+                             f'Run with "-D http_mode=record" to record it.')
+
+    logger.debug(f'Replayed "{request_type}" request to "{endpoint}" from the cassette.')
+
+    return response
+
+
+def close():
+    """This function writes the index of a recording cassette and releases the memory-mapped bodies."""
+
+    store = _state['store']
+
+    if store is None:
+        return
+
+    if _state['mode'] == RECORD_MODE:
+        store.save()
+        logger.debug(f'< Saved the cassette in "{store.cassette_dir}".')
+
+    store.close()
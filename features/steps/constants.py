@@ -44,6 +44,7 @@ class BackOfficeConstant(Enum):
 
 class FrontEndURL(Enum):
     homepage_url = '/parabank/index.htm'
+    overview_url = '/parabank/overview.htm'
 
 
 class FrontEndXpath(Enum):
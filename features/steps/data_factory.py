@@ -0,0 +1,147 @@
+import itertools
+import logging
+import random
+import string
+import threading
+
+from steps import cassette, payload_templates
+
+logger = logging.getLogger('myLogger')
+
+BASE36_DIGITS = string.digits + string.ascii_lowercase
+
+# The random letters and digits of every payload, see RegistrationDataFactory.build_payload.
+LETTERS_PER_PAYLOAD = 30
+DIGITS_PER_PAYLOAD = 27
+
+
+def to_base36(number):
+    digits = []
+
+    while True:
+        number, remainder = divmod(number, 36)
+        digits.append(BASE36_DIGITS[remainder])
+
+        if not number:
+            return ''.join(reversed(digits))
+
+
+class RegistrationDataFactory:
+    """This class generates unique registration payloads from a seed.
+
+    The same seed and worker always produce the same payloads. Usernames come from a sequence partitioned between the
+    workers (worker 0 of 2 uses 0, 2, 4, ... and worker 1 uses 1, 3, 5, ...), so parallel workers never collide.
+
+    Args:
+        seed (int): The seed of the random data, a random seed is used if None.
+        worker_id (int): The index of this worker among the parallel workers.
+        workers (int): The number of parallel workers.
+        _username_prefix (str): The prefix of every generated username.
+    """
+
+    def __init__(self, seed=None, worker_id=0, workers=1, _username_prefix='u'):
+
+        if seed is None:
+            seed = random.SystemRandom().randrange(36 ** 6)
+
+        self.seed = seed
+        self.worker_id = worker_id
+        self.workers = max(1, workers)
+
+        self._random = random.Random(f'{seed}-{worker_id}')
+        self._sequence = itertools.count(worker_id, self.workers)
+        self._lock = threading.Lock()
+
+        # The run tag keeps usernames of runs with different seeds apart on a server that outlives the run.
+        self._username_prefix = f'{_username_prefix}{to_base36(seed % 36 ** 6)}'
+
+        logger.debug(f'Test data seed is "{seed}" for worker {worker_id} of {self.workers}.')
+
+    def get_string(self, length, _chars=string.ascii_lowercase):
+        return ''.join(self._random.choices(_chars, k=length))
+
+    def build_payload(self, username, letters, digits):
+        return payload_templates.register_customer.overlay({
+            'customer.firstName': letters[:6].title(),
+            'customer.lastName': letters[6:14].title(),
+            'customer.address.street': f'{digits[:3]} {letters[14:22].title()} Street',
+            'customer.address.city': letters[22:30].title(),
+            'customer.address.zipCode': digits[3:8],
+            'customer.phoneNumber': digits[8:18],
+            'customer.ssn': digits[18:27],
+            'customer.username': username,
+        })
+
+    def new_payload(self):
+        """This function generates the next unique registration payload.
+
+        Returns:
+            payload (PayloadOverlay): The registration payload in the format of ApiConstant.register_customer_payload.
+        """
+
+        return self.batch(1)[0]
+
+    def stream(self):
+        """This function lazily generates unique registration payloads one at a time.
+
+        Yields:
+            payload (PayloadOverlay): The next unique registration payload.
+        """
+
+        while True:
+            yield self.new_payload()
+
+    def batch(self, count):
+        """This function generates many unique registration payloads from one block of random data.
+
+        The usernames and the random letters and digits of all the payloads are drawn at once under the lock. A batch
+        is reproducible from the seed, but it draws its data differently from as many new_payload calls.
+
+        Args:
+            count (int): The number of payloads to generate.
+
+        Returns:
+            payloads (list): The registration payloads.
+        """
+
+        with self._lock:
+            usernames = [f'{self._username_prefix}{to_base36(next(self._sequence))}' for _ in range(count)]
+            letters = self.get_string(LETTERS_PER_PAYLOAD * count)
+            digits = self.get_string(DIGITS_PER_PAYLOAD * count, string.digits)
+
+        return [self.build_payload(username, letters[index * LETTERS_PER_PAYLOAD:(index + 1) * LETTERS_PER_PAYLOAD],
+                                   digits[index * DIGITS_PER_PAYLOAD:(index + 1) * DIGITS_PER_PAYLOAD])
+                for index, username in enumerate(usernames)]
+
+
+_state = {'factory': None}
+_state_lock = threading.Lock()
+
+
+def get_factory(context):
+    """This function returns the data factory of this worker, seeded from behave.ini.
+
+    The seed is set with "-D data_seed", the worker with "-D worker_id" and "-D workers". Virtual users of a load test
+    are separate workers. Without a seed, a replayed run uses the seed stored in the cassette by its recording, so the
+    requests carry the same usernames as the recorded ones.
+
+    Args:
+        context (Context): The default object is available throughout Behave framework.
+
+    Returns:
+        factory (RegistrationDataFactory): The factory shared by the whole run.
+    """
+
+    with _state_lock:
+
+        if _state['factory'] is None:
+            userdata = context.config.userdata
+            seed = int(userdata['data_seed']) if userdata.get('data_seed') else cassette.get_data_seed()
+
+            worker_id = int(userdata.get('worker_id', userdata.get('load_user', 0)))
+            workers = int(userdata.get('workers', 1))
+
+            _state['factory'] = RegistrationDataFactory(seed, worker_id, workers)
+            cassette.set_data_seed(_state['factory'].seed)
+
+        return _state['factory']
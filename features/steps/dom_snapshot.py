@@ -0,0 +1,212 @@
+import logging
+from html.parser import HTMLParser
+
+try:
+    from lxml import html as lxml_html
+except ImportError:
+    lxml_html = None
+
+logger = logging.getLogger('myLogger')
+
+HIDDEN_ATTR = 'data-snapshot-hidden'
+
+# Counts the DOM mutations of the document from the first snapshot of it on, the copy itself is never observed.
+CHANGES_SCRIPT = '''
+var changes = window.__domSnapshotChanges;
+return changes ? changes.count : -1;
+'''
+
+# Serializes a copy of the page in which every element that is not rendered carries HIDDEN_ATTR, the page itself is
+# left untouched. Both getElementsByTagName lists are in document order, so the copy of elems[i] is copies[i].
+# Opacity is not inherited like visibility, so the elements inside a transparent element are marked along with it.
+# Returns the copy and the mutation count it was taken at.
+SNAPSHOT_SCRIPT = '''
+if (!window.__domSnapshotChanges) {
+    var changes = window.__domSnapshotChanges = {count: 0};
+    new MutationObserver(function (records) { changes.count += records.length; })
+        .observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+}
+
+var root = document.documentElement;
+var copy = root.cloneNode(true);
+var elems = root.getElementsByTagName('*');
+var copies = copy.getElementsByTagName('*');
+var transparent = new Set();
+
+for (var i = 0; i < elems.length; i++) {
+    var style = window.getComputedStyle(elems[i]);
+
+    if (style.opacity === '0' || transparent.has(elems[i].parentElement)) {
+        transparent.add(elems[i]);
+    }
+
+    if (!elems[i].getClientRects().length || style.visibility === 'hidden' || transparent.has(elems[i])) {
+        copies[i].setAttribute('%s', '');
+    }
+}
+
+return [copy.outerHTML, window.__domSnapshotChanges.count];
+''' % HIDDEN_ATTR
+
+VOID_ELEMENTS = frozenset(('area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source',
+                           'track', 'wbr'))
+
+
+class SnapshotNode:
+    """This class is an element of the snapshot along with its own text nodes, the way XPath text() sees them."""
+
+    __slots__ = ('tag', 'texts', 'hidden')
+
+    def __init__(self, tag, hidden):
+        self.tag = tag
+        self.texts = []
+        self.hidden = hidden
+
+
+class SnapshotParser(HTMLParser):
+    """This class builds the snapshot nodes with the standard library when lxml is not installed."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.nodes = []
+        self._open = []
+
+    def handle_starttag(self, tag, attrs):
+        node = SnapshotNode(tag, any(name == HIDDEN_ATTR for name, _ in attrs))
+        self.nodes.append(node)
+
+        if tag not in VOID_ELEMENTS:
+            self._open.append(node)
+
+    def handle_endtag(self, tag):
+
+        for index in range(len(self._open) - 1, -1, -1):
+
+            if self._open[index].tag == tag:
+                del self._open[index:]
+                break
+
+    def handle_data(self, data):
+
+        if self._open:
+            self._open[-1].texts.append(data)
+
+
+class DomSnapshot:
+    """This class answers text queries about a page from one copy of its DOM.
+
+    Args:
+        source (str): The HTML of the page, with HIDDEN_ATTR on the elements that are not rendered.
+    """
+
+    def __init__(self, source):
+        self.queries = 0
+
+        if lxml_html is not None:
+            tree = lxml_html.document_fromstring(source)
+            self.nodes = [self.get_node(elem) for elem in tree.iter() if isinstance(elem.tag, str)]
+        else:
+            parser = SnapshotParser()
+            parser.feed(source)
+            parser.close()
+            self.nodes = parser.nodes
+
+        # Exact text queries are answered from the index, the others scan the first text node of each element.
+        self._text_index = {}
+
+        for node in self.nodes:
+
+            for text in node.texts:
+                self._text_index.setdefault(text, []).append(node)
+
+    @staticmethod
+    def get_node(elem):
+        node = SnapshotNode(elem.tag, HIDDEN_ATTR in elem.attrib)
+        node.texts = [text for text in [elem.text] + [child.tail for child in elem] if text is not None]
+
+        return node
+
+    def find_by_text(self, elems_text, _exact_text=False, _visible_only=True):
+        """This function finds the elements having the text, or having exactly the text.
+
+        The text is matched like FrontEndXpath.locate_elem_by_exact_text_xpath and locate_elem_by_having_text_xpath,
+        i.e. a partial match only looks at the first text node of an element.
+
+        Args:
+            elems_text (str): The visible text of the elements that we are looking for.
+            _exact_text (bool): This flag helps to decide whether an element has the exact text or contains the text.
+            _visible_only (bool): Leave out the elements that are not rendered.
+
+        Returns:
+            nodes (list): The matching nodes of the snapshot.
+        """
+
+        self.queries += 1
+
+        if _exact_text:
+            nodes = list(dict.fromkeys(self._text_index.get(elems_text, [])))
+        else:
+            nodes = [node for node in self.nodes if node.texts and elems_text in node.texts[0]]
+
+        return [node for node in nodes if not (_visible_only and node.hidden)]
+
+
+_snapshots = {}
+
+_counters = {'snapshots': 0, 'queries': 0}
+
+
+def get_snapshot(driver):
+    """This function returns the snapshot of the page in the browser, taking it again once the page has changed.
+
+    A snapshot is only reused while the document it was taken of is shown and has not been mutated since, which costs
+    one round trip instead of the snapshot. A new document has no mutation counter, so it never matches.
+
+    Args:
+        driver (WebDriver): The browser.
+
+    Returns:
+        snapshot (DomSnapshot): The snapshot of the current page.
+    """
+
+    changes_snapshot = _snapshots.get(driver.session_id)
+
+    if changes_snapshot is not None:
+
+        if changes_snapshot[0] == driver.execute_script(CHANGES_SCRIPT):
+            return changes_snapshot[1]
+
+        _counters['queries'] += changes_snapshot[1].queries
+
+    source, changes = driver.execute_script(SNAPSHOT_SCRIPT)
+    snapshot = DomSnapshot(source)
+    _snapshots[driver.session_id] = (changes, snapshot)
+    _counters['snapshots'] += 1
+
+    logger.debug(f'Took a snapshot of the page with {len(snapshot.nodes)} elements.')
+
+    return snapshot
+
+
+def invalidate(driver):
+    """This function drops the snapshot of a browser after the page changed.
+
+    Args:
+        driver (WebDriver): The browser.
+    """
+
+    changes_snapshot = _snapshots.pop(driver.session_id, None)
+
+    if changes_snapshot is not None:
+        _counters['queries'] += changes_snapshot[1].queries
+
+
+def close():
+    """This function reports how many queries the snapshots answered."""
+
+    _counters['queries'] += sum(snapshot.queries for _, snapshot in _snapshots.values())
+    _snapshots.clear()
+
+    if _counters['snapshots']:
+        logger.debug(f'< DOM snapshots | Snapshots: {_counters["snapshots"]} | Queries: {_counters["queries"]} | '
+                     f'Parser: {"lxml" if lxml_html is not None else "html.parser"}')
@@ -2,14 +2,14 @@ import logging
 
 from behave import fixture
 
-from steps import utils
+from steps import account_pool, browser_pool, utils
 
 logger = logging.getLogger('myLogger')
 
 
 @fixture
 def test_in_browser(context):
-    """This function provides a Chrome browser instance to perform automated actions.
+    """This function provides a warm Chrome browser instance from the browser pool to perform automated actions.
 
     Args:
         context (Context): The default object is available throughout behave framework.
@@ -18,27 +18,26 @@ def test_in_browser(context):
         browser (ChromeDriver): The Chrome driver instance.
     """
 
-    logger.debug('--- Initiating Fixture to create a browser instance for Web Testing. ---')
+    logger.debug('--- Initiating Fixture to lease a browser instance for Web Testing. ---')
 
-    # Quit previous browser instance before we launch a new one to avoid low memory crashes.
-    if hasattr(context, 'browser'):
-        context.browser.quit()
+    # The pool caps the number of running browsers at BROWSER_POOL_MAX, which avoids low memory crashes.
+    pool = browser_pool.get_pool(context, lambda: utils.get_browser(context))
 
-    browser = utils.get_browser(context)
+    browser = pool.lease()
     context.browser = browser
 
-    logger.debug('--- A browser instance for Web Testing has been created. ---')
+    logger.debug('--- A browser instance for Web Testing has been leased. ---')
 
     yield browser
 
-    browser.quit()
+    pool.release(browser)
 
-    logger.debug('--- Quiting the browser instance after Web Testing. ---')
+    logger.debug('--- Returned the browser instance to the browser pool after Web Testing. ---')
 
 
 @fixture
 def create_account(context):
-    """This function creates a customer account for API testing.
+    """This function creates a customer account for API testing, or leases one from the account pool if enabled.
 
     Args:
         context (Context): The default object is available throughout behave framework.
@@ -46,6 +45,25 @@ def create_account(context):
 
     logger.debug('--- Initiating Fixture to create a Customer Account. ---')
 
+    pool = account_pool.get_pool()
+
+    if pool is not None:
+        account = pool.lease()
+        context.registration_payload = dict(account)
+
+        # The scenario still needs a session of its own to login with.
+        context.execute_steps('''
+            Given the user has already visited the homepage of parabank.
+        ''')
+
+        logger.debug(f'--- Leased the Customer Account "{account["customer.username"]}" from the account pool. ---')
+
+        yield account
+
+        pool.release(account)
+
+        return
+
     context.execute_steps('''
         Given the user has already visited the registration page of parabank with "a valid" JSESSIONID.
         And the user has a public endpoint to register a customer account.
@@ -56,3 +74,5 @@ def create_account(context):
     ''')
 
     logger.debug(f'--- A Customer Account is created. ---')
+
+    yield context.registration_payload
@@ -0,0 +1,111 @@
+import base64
+import hmac
+import logging
+from functools import lru_cache
+
+from steps import payload_templates
+
+logger = logging.getLogger('myLogger')
+
+# Number of recently generated hashes kept in memory.
+HASH_CACHE_SIZE = 4096
+
+# The "algo" names of ApiConstant.hash_generating_payload and their hashlib names.
+ALGORITHMS = {
+    'MD5': 'md5',
+    'SHA-1': 'sha1',
+    'SHA-224': 'sha224',
+    'SHA-256': 'sha256',
+    'SHA-384': 'sha384',
+    'SHA-512': 'sha512',
+}
+
+# The "outputFormat" names of ApiConstant.hash_generating_payload, "text" is the hex digest.
+OUTPUT_FORMATS = {
+    'text': lambda digest: digest.hex(),
+    'hex': lambda digest: digest.hex(),
+    'base64': lambda digest: base64.b64encode(digest).decode('ascii'),
+}
+
+
+def validate_hash_options(algo, output_format):
+    """This function validates the algorithm and output format of a hash.
+
+    Raises:
+        AssertionError: An exception arises if any of the following situations occur:
+                        1) if the algorithm is not supported.
+                        2) if the output format is not supported.
+    """
+
+    if algo.upper() not in ALGORITHMS:
+        raise AssertionError(f'Unsupported hash algorithm "{algo}", expected one of {list(ALGORITHMS)}.')
+
+    if output_format.lower() not in OUTPUT_FORMATS:
+        raise AssertionError(f'Unsupported hash output format "{output_format}", expected one of '
+                             f'{list(OUTPUT_FORMATS)}.')
+
+
+@lru_cache(maxsize=HASH_CACHE_SIZE)
+def get_hmac(input_string, secret_key, algo='SHA-256', output_format='text'):
+    """This function generates the HMAC of the input string locally.
+
+    Args:
+        input_string (str): The string to generate the HMAC of.
+        secret_key (str): The secret key of the HMAC.
+        algo (str): The hash algorithm. i.e. 'SHA-256'
+        output_format (str): The format of the HMAC. i.e. 'text', 'hex' or 'base64'
+
+    Returns:
+        hash_string (str): The HMAC in the requested format.
+    """
+
+    validate_hash_options(algo, output_format)
+
+    digest = hmac.new(secret_key.encode('utf-8'), input_string.encode('utf-8'), ALGORITHMS[algo.upper()]).digest()
+
+    return OUTPUT_FORMATS[output_format.lower()](digest)
+
+
+def generate_hash(payload):
+    """This function generates the HMAC described by a payload in the format of ApiConstant.hash_generating_payload.
+
+    Args:
+        payload (dict): The inputString, secretKey, algo and outputFormat of the HMAC.
+
+    Returns:
+        hash_string (str): The HMAC in the requested format.
+    """
+
+    payload = payload_templates.hash_generating.overlay(payload)
+
+    return get_hmac(payload['inputString'], payload['secretKey'], payload['algo'], payload['outputFormat'])
+
+
+def generate_hashes(input_strings, secret_key, algo='SHA-256', output_format='text'):
+    """This function generates the HMACs of many strings with the same key in one call.
+
+    Args:
+        input_strings (Iterable): The strings to generate the HMACs of. i.e. the usernames of the accounts to set up.
+        secret_key (str): The secret key of the HMACs.
+        algo (str): The hash algorithm. i.e. 'SHA-256'
+        output_format (str): The format of the HMACs. i.e. 'text', 'hex' or 'base64'
+
+    Returns:
+        hashes (dict): The HMAC of every input string.
+    """
+
+    validate_hash_options(algo, output_format)
+
+    # The key is hashed once, every string only continues from copies of the keyed state.
+    keyed_hmac = hmac.new(secret_key.encode('utf-8'), digestmod=ALGORITHMS[algo.upper()])
+    encode = OUTPUT_FORMATS[output_format.lower()]
+    hashes = {}
+
+    for input_string in input_strings:
+        string_hmac = keyed_hmac.copy()
+        string_hmac.update(input_string.encode('utf-8'))
+        hashes[input_string] = encode(string_hmac.digest())
+
+    logger.debug(f'Generated {len(hashes)} hashes with "{algo}".')
+
+    return hashes
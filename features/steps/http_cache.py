@@ -0,0 +1,269 @@
+import copy
+import logging
+import threading
+import time
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger('myLogger')
+
+# Responses varying on other request headers than these are not cached, the cache key only holds the cookie.
+CACHE_VARY_HEADERS = ('cookie', 'accept-encoding')
+
+# Headers of a 304 response that must not replace the ones of the cached response.
+BODY_HEADERS = ('content-length', 'content-encoding', 'transfer-encoding')
+
+
+def parse_cache_control(headers):
+    directives = {}
+
+    for directive in headers.get('Cache-Control', '').split(','):
+        name, _, value = directive.strip().partition('=')
+
+        if name:
+            directives[name.lower()] = value.strip('"')
+
+    return directives
+
+
+def get_freshness_lifetime(headers):
+    """This function returns the time in seconds the response can be served without asking the server.
+
+    Args:
+        headers (CaseInsensitiveDict): The headers of the response.
+
+    Returns:
+        lifetime (float): The max-age of Cache-Control or the time until Expires, 0 if the response is stale right away.
+    """
+
+    directives = parse_cache_control(headers)
+
+    if 'no-cache' in directives:
+        return 0.0
+
+    if 'max-age' in directives:
+
+        try:
+            return float(directives['max-age'])
+        except ValueError:
+            return 0.0
+
+    if 'Expires' in headers and 'Date' in headers:
+
+        try:
+            return (parsedate_to_datetime(headers['Expires']) - parsedate_to_datetime(headers['Date'])).total_seconds()
+        except (TypeError, ValueError):
+            return 0.0
+
+    return 0.0
+
+
+def is_cacheable(response):
+    """This function decides whether a response may be stored in the cache.
+
+    Responses setting a cookie are never stored, serving them again would hand out the same JSESSIONID twice.
+
+    Args:
+        response (Response): The response of a GET request.
+
+    Returns:
+        cacheable (bool): Whether the response can be stored.
+    """
+
+    if response.status_code != 200 or 'Set-Cookie' in response.headers:
+        return False
+
+    if 'no-store' in parse_cache_control(response.headers):
+        return False
+
+    vary = {header.strip().lower() for header in response.headers.get('Vary', '').split(',') if header.strip()}
+
+    if not vary.issubset(CACHE_VARY_HEADERS):
+        return False
+
+    has_validator = 'ETag' in response.headers or 'Last-Modified' in response.headers
+
+    return has_validator or get_freshness_lifetime(response.headers) > 0
+
+
+class CacheEntry:
+    __slots__ = ('response', 'stored_at', 'lifetime')
+
+    def __init__(self, response):
+        self.response = response
+        self.stored_at = time.monotonic()
+        self.lifetime = get_freshness_lifetime(response.headers)
+
+    def is_fresh(self):
+        return time.monotonic() - self.stored_at < self.lifetime
+
+    def get_validators(self):
+        validators = {}
+
+        if 'ETag' in self.response.headers:
+            validators['If-None-Match'] = self.response.headers['ETag']
+
+        if 'Last-Modified' in self.response.headers:
+            validators['If-Modified-Since'] = self.response.headers['Last-Modified']
+
+        return validators
+
+
+class HttpCache:
+    """This class is a bounded LRU cache of GET responses that honors Cache-Control, ETag and Last-Modified.
+
+    Args:
+        max_entries (int): The number of responses to keep, the least recently used one is evicted first.
+    """
+
+    def __init__(self, max_entries=128):
+        self.max_entries = max_entries
+
+        self.hits = 0
+        self.revalidations = 0
+        self.misses = 0
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_entry(self, key):
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+            return entry
+
+    def store(self, key, response):
+
+        with self._lock:
+            self._entries[key] = CacheEntry(response)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def count(self, counter):
+
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def send(self, spec, send_request):
+        """This function serves a GET request from the cache, revalidating it with the server when it is stale.
+
+        Args:
+            spec (RequestSpec): The GET request.
+            send_request (Callable): The function that sends a RequestSpec and returns the response.
+
+        Returns:
+            response (Response): The cached, revalidated or new response.
+        """
+
+        key = (spec.endpoint, spec.headers.get('Cookie', ''))
+        entry = self.get_entry(key)
+
+        if entry is not None and entry.is_fresh():
+            self.count('hits')
+            logger.debug(f'Served "{spec.endpoint}" from the HTTP cache.')
+
+            return copy.copy(entry.response)
+
+        validators = entry.get_validators() if entry is not None else {}
+        response = send_request(spec.replace(headers={**spec.headers, **validators}) if validators else spec)
+
+        if response.status_code == 304 and entry is not None:
+            self.count('revalidations')
+            logger.debug(f'Revalidated "{spec.endpoint}" in the HTTP cache.')
+
+            return self.refresh(key, entry, response)
+
+        self.count('misses')
+
+        if is_cacheable(response):
+            self.store(key, response)
+
+        return response
+
+    def refresh(self, key, entry, not_modified):
+        """This function combines the cached body with the headers and cookies of a 304 response.
+
+        Args:
+            key (tuple): The key of the entry.
+            entry (CacheEntry): The stale entry.
+            not_modified (Response): The 304 response of the server.
+
+        Returns:
+            response (Response): The cached response updated by the 304 response.
+        """
+
+        response = copy.copy(entry.response)
+        response.headers = CaseInsensitiveDict(entry.response.headers)
+        response.headers.update({name: value for name, value in not_modified.headers.items()
+                                 if name.lower() not in BODY_HEADERS})
+
+        # Cookies set by the 304 response reach the scenario but are never stored with the entry.
+        response.cookies = not_modified.cookies
+        response.elapsed = not_modified.elapsed
+
+        stored = copy.copy(response)
+        stored.headers = CaseInsensitiveDict({name: value for name, value in response.headers.items()
+                                              if name.lower() != 'set-cookie'})
+
+        if is_cacheable(stored):
+            self.store(key, stored)
+
+        return response
+
+
+_state = {'cache': None}
+
+
+def configure(context):
+    """This function creates the HTTP cache if it is enabled in behave.ini.
+
+    Args:
+        context (Context): The default object is available throughout Behave framework.
+    """
+
+    userdata = context.config.userdata
+
+    if str(userdata.get('HTTP_CACHE', 'false')).lower() != 'true':
+        return
+
+    _state['cache'] = HttpCache(int(userdata.get('HTTP_CACHE_SIZE', 128)))
+
+    logger.debug('--- Enabled the HTTP cache. ---')
+
+
+def get_cache(spec):
+    """This function returns the HTTP cache if the request is allowed to use it.
+
+    Args:
+        spec (RequestSpec): The request about to be sent.
+
+    Returns:
+        cache (HttpCache): The HTTP cache, None if it is disabled or the request does not opt in.
+    """
+
+    if not spec.cacheable or spec.method != 'GET':
+        return None
+
+    return _state['cache']
+
+
+def close():
+    """This function reports the hits and misses of the HTTP cache."""
+
+    cache = _state['cache']
+
+    if cache is None:
+        return
+
+    _state['cache'] = None
+
+    logger.debug(f'< Closed the HTTP cache | Hits: {cache.hits} | Revalidated: {cache.revalidations} | '
+                 f'Misses: {cache.misses}')
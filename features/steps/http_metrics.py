@@ -0,0 +1,277 @@
+import csv
+import json
+import logging
+import os
+import threading
+from time import perf_counter
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+logger = logging.getLogger('myLogger')
+
+PERCENTILES = (50, 95, 99)
+
+# Timings are reported in milliseconds, body sizes in bytes. Connect, TLS, TTFB and download belong to the attempt
+# that got the response, the redirect hops before it and the failed attempts and backoff of the retries are apart.
+TIMING_METRICS = ('connect', 'tls', 'ttfb', 'download', 'redirect', 'retry_wait', 'total')
+SIZE_METRICS = ('body_size',)
+COUNT_METRICS = ('redirects', 'retries')
+UNSCALED_METRICS = SIZE_METRICS + COUNT_METRICS
+
+# Connection timings of the request attempt currently sent by each thread.
+_connection_timings = threading.local()
+
+
+def _add_connection_timing(metric, seconds):
+    timings = getattr(_connection_timings, 'timings', None)
+
+    if timings is not None:
+        timings[metric] = timings.get(metric, 0.0) + seconds
+
+
+class TimedHTTPConnection(HTTPConnection):
+
+    def _new_conn(self):
+        started_at = perf_counter()
+        sock = super()._new_conn()
+        _add_connection_timing('connect', perf_counter() - started_at)
+
+        return sock
+
+
+class TimedHTTPSConnection(HTTPSConnection):
+
+    def _new_conn(self):
+        started_at = perf_counter()
+        sock = super()._new_conn()
+        _add_connection_timing('connect', perf_counter() - started_at)
+
+        return sock
+
+    def connect(self):
+        # The TLS handshake is the part of connecting that comes after opening the socket.
+        timings = getattr(_connection_timings, 'timings', None)
+        connect_before = timings.get('connect', 0.0) if timings is not None else 0.0
+
+        started_at = perf_counter()
+        super().connect()
+        elapsed = perf_counter() - started_at
+
+        if timings is not None:
+            _add_connection_timing('tls', elapsed - (timings.get('connect', 0.0) - connect_before))
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """This class is the transport adapter whose new connections report their connect and TLS handshake times."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+
+        self.poolmanager.pool_classes_by_scheme = {'http': TimedHTTPConnectionPool,
+                                                   'https': TimedHTTPSConnectionPool}
+
+
+class LatencyHistogram:
+    """This class is an HDR-style histogram with a bounded relative error and a fixed memory footprint.
+
+    Values below 2 ** precision_bits are counted exactly, larger values share a bucket with the values that only
+    differ after their first precision_bits significant bits.
+    """
+
+    def __init__(self, precision_bits=10):
+        self.precision_bits = precision_bits
+        self.counts = {}
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def get_bucket(self, value):
+        shift = max(0, value.bit_length() - self.precision_bits)
+        return shift, value >> shift
+
+    def record(self, value):
+        value = max(0, int(value))
+        bucket = self.get_bucket(value)
+
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def get_percentile(self, percentile):
+
+        if not self.count:
+            return 0
+
+        rank = max(1, int(round(percentile / 100 * self.count)))
+        seen = 0
+
+        for shift, mantissa in sorted(self.counts, key=lambda bucket: bucket[1] << bucket[0]):
+            seen += self.counts[(shift, mantissa)]
+
+            if seen >= rank:
+                # The highest value of the bucket, never above the highest recorded value.
+                return min(((mantissa + 1) << shift) - 1, self.max)
+
+        return self.max
+
+
+class RequestMetrics:
+    """This class aggregates the timing breakdown of every request in histograms per endpoint."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.endpoints = {}
+
+    def record(self, endpoint, timings):
+
+        with self.lock:
+            histograms = self.endpoints.setdefault(endpoint, {})
+
+            for metric, value in timings.items():
+                # Timings are kept in microseconds so the histograms only count integers.
+                scale = 1 if metric in UNSCALED_METRICS else 1000000
+                histograms.setdefault(metric, LatencyHistogram()).record(value * scale)
+
+    def summarize(self):
+        summary = {}
+
+        with self.lock:
+
+            for endpoint, histograms in sorted(self.endpoints.items()):
+                summary[endpoint] = {}
+
+                for metric, histogram in histograms.items():
+                    scale = 1 if metric in UNSCALED_METRICS else 1000
+
+                    metric_summary = {'count': histogram.count, 'max': histogram.max / scale}
+
+                    for percentile in PERCENTILES:
+                        metric_summary[f'p{percentile}'] = histogram.get_percentile(percentile) / scale
+
+                    summary[endpoint][metric] = metric_summary
+
+        return summary
+
+    def export(self, metrics_dir, _file_name='http_metrics'):
+        """This function writes the percentiles of every endpoint as JSON and CSV files.
+
+        Args:
+            metrics_dir (str): The directory to write the files into.
+            _file_name (str): The name of the files without their extension.
+        """
+
+        summary = self.summarize()
+
+        if not summary:
+            return
+
+        os.makedirs(metrics_dir, exist_ok=True)
+        json_path = os.path.join(metrics_dir, f'{_file_name}.json')
+        csv_path = os.path.join(metrics_dir, f'{_file_name}.csv')
+
+        with open(json_path, 'w') as json_file:
+            json.dump(summary, json_file, indent=2)
+
+        with open(csv_path, 'w', newline='') as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(['endpoint', 'metric', 'count'] + [f'p{percentile}' for percentile in PERCENTILES] +
+                            ['max'])
+
+            for endpoint, metrics in summary.items():
+
+                for metric, metric_summary in metrics.items():
+                    writer.writerow([endpoint, metric, metric_summary['count']] +
+                                    [round(metric_summary[f'p{percentile}'], 3) for percentile in PERCENTILES] +
+                                    [round(metric_summary['max'], 3)])
+
+        logger.debug(f'< Saved the HTTP metrics in "{json_path}" and "{csv_path}".')
+
+
+request_metrics = RequestMetrics()
+
+
+def start_request():
+    """This function starts collecting the connection timings of the request about to be sent by this thread.
+
+    Returns:
+        started_at (float): The performance counter value when the request started.
+    """
+
+    started_at = perf_counter()
+
+    _connection_timings.timings = {}
+    _connection_timings.attempts = 0
+    _connection_timings.attempt_started_at = started_at
+
+    return started_at
+
+
+def start_attempt():
+    """This function starts the timings of another attempt of the request being timed by this thread, if any.
+
+    The connection timings of the earlier attempts are dropped, their time is reported as the retry wait.
+    """
+
+    if getattr(_connection_timings, 'timings', None) is None:
+        return
+
+    _connection_timings.timings = {}
+    _connection_timings.attempts += 1
+    _connection_timings.attempt_started_at = perf_counter()
+
+
+def finish_request(endpoint, response, started_at):
+    """This function completes the timing breakdown of the request and adds it to the histograms of its endpoint.
+
+    Args:
+        endpoint (str): The name of the endpoint to aggregate the request under. i.e. 'GET /parabank/index.htm'
+        response (Response): The response of the request.
+        started_at (float): The value returned by start_request.
+
+    Returns:
+        timings (dict): The times in seconds of TIMING_METRICS, the number of redirects and retries and the body size
+                        in bytes.
+    """
+
+    finished_at = perf_counter()
+    connection_timings = getattr(_connection_timings, 'timings', None) or {}
+    attempt_started_at = getattr(_connection_timings, 'attempt_started_at', started_at)
+    attempts = max(1, getattr(_connection_timings, 'attempts', 1))
+    _connection_timings.timings = None
+
+    connect = connection_timings.get('connect', 0.0)
+    tls = connection_timings.get('tls', 0.0)
+
+    # Requests measures every hop until its response headers were parsed, connecting included.
+    headers_received = response.elapsed.total_seconds()
+    redirect = sum(hop.elapsed.total_seconds() for hop in response.history)
+
+    timings = {
+        'connect': connect,
+        'tls': tls,
+        'ttfb': max(0.0, headers_received - connect - tls),
+        'download': max(0.0, finished_at - attempt_started_at - redirect - headers_received),
+        'redirect': redirect,
+        'retry_wait': attempt_started_at - started_at if attempts > 1 else 0.0,
+        'total': finished_at - started_at,
+        'redirects': len(response.history),
+        'retries': attempts - 1,
+        'body_size': len(response.content),
+    }
+
+    request_metrics.record(endpoint, timings)
+
+    return timings
@@ -0,0 +1,116 @@
+import logging
+import os
+import threading
+from http.cookiejar import DefaultCookiePolicy
+
+import requests
+
+from steps import http_metrics
+
+logger = logging.getLogger('myLogger')
+
+# Every worker (process + thread) owns its own pooled session, requests.Session is not safe to share across threads.
+_worker_state = threading.local()
+
+_sessions_lock = threading.Lock()
+_open_sessions = []
+
+_pool_settings = {
+    'pool_connections': 4,
+    'pool_maxsize': 10,
+    'pool_block': False,
+    'keep_alive': True,
+}
+
+
+def _to_bool(value):
+    return str(value).strip().lower() == 'true'
+
+
+def configure_sessions(context):
+    """This function reads the connection pool settings from behave.ini for all the sessions created afterwards.
+
+    Args:
+        context (Context): The default object is available throughout Behave framework.
+    """
+
+    userdata = context.config.userdata
+
+    _pool_settings['pool_connections'] = int(userdata.get('HTTP_POOL_CONNECTIONS', _pool_settings['pool_connections']))
+    _pool_settings['pool_maxsize'] = int(userdata.get('HTTP_POOL_MAXSIZE', _pool_settings['pool_maxsize']))
+    _pool_settings['pool_block'] = _to_bool(userdata.get('HTTP_POOL_BLOCK', _pool_settings['pool_block']))
+    _pool_settings['keep_alive'] = _to_bool(userdata.get('HTTP_KEEP_ALIVE', _pool_settings['keep_alive']))
+
+    logger.debug(f'HTTP connection pool settings: {_pool_settings}')
+
+
+def create_session():
+    """This function creates a connection pooled session that never stores the cookies it receives.
+
+    Cookies are kept out of the session on purpose, every step passes its JSESSIONID explicitly through the headers
+    exactly like it did with the module-level requests calls.
+
+    Returns:
+        session (Session): The session with a keep-alive connection pool mounted for http and https.
+    """
+
+    session = requests.Session()
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+
+    adapter = http_metrics.TimedHTTPAdapter(pool_connections=_pool_settings['pool_connections'],
+                                            pool_maxsize=_pool_settings['pool_maxsize'],
+                                            pool_block=_pool_settings['pool_block'])
+
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+
+    if not _pool_settings['keep_alive']:
+        session.headers['Connection'] = 'close'
+
+    with _sessions_lock:
+        _open_sessions.append(session)
+
+    return session
+
+
+def get_session():
+    """This function returns the pooled session of the current worker and creates one on the first call.
+
+    Returns:
+        session (Session): The session owned by the current process and thread.
+    """
+
+    session = getattr(_worker_state, 'session', None)
+
+    # A forked worker must not reuse the sockets of its parent process.
+    if session is None or _worker_state.pid != os.getpid():
+        session = create_session()
+        _worker_state.session = session
+        _worker_state.pid = os.getpid()
+
+    return session
+
+
+def warm_up_session(server, _timeout=5):
+    """This function opens the first keep-alive connection to the server so the first step does not pay the handshake.
+
+    Args:
+        server (str): The base url of the server under test.
+        _timeout (int): The time in seconds to wait for the server before giving up on warming up.
+    """
+
+    try:
+        get_session().head(server, timeout=_timeout, allow_redirects=False)
+        logger.debug(f'--- Warmed up the HTTP connection pool for "{server}". ---')
+    except requests.RequestException as error:
+        logger.debug(f'Unable to warm up the HTTP connection pool for "{server}": {error}')
+
+
+def close_sessions():
+    """This function closes every pooled session along with its open connections."""
+
+    with _sessions_lock:
+        while _open_sessions:
+            _open_sessions.pop().close()
+
+    _worker_state.__dict__.clear()
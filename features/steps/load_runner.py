@@ -0,0 +1,285 @@
+import argparse
+import json
+import logging
+import multiprocessing
+import queue
+import random
+import sys
+import time
+
+from behave.configuration import Configuration
+from behave.runner_util import parse_features
+from behave.runner import Runner
+
+logger = logging.getLogger('myLogger')
+
+PERCENTILES = (50, 95, 99)
+
+# The time in seconds between two checks whether the virtual users without results are still alive.
+RESULTS_POLL_INTERVAL = 1
+
+
+class LoadTestRunner(Runner):
+    """This class is a behave runner that repeats the selected scenarios for one virtual user.
+
+    The hooks run once per virtual user, so the pooled connections and fixtures of before_all are shared by all of its
+    iterations while every iteration runs on freshly parsed features.
+    """
+
+    def __init__(self, config, iterations=0, deadline=0):
+        super().__init__(config)
+
+        self.iterations = iterations
+        self.deadline = deadline
+        self.completed_iterations = 0
+        self.step_samples = {}
+
+    def has_next_iteration(self):
+
+        if self.aborted:
+            return False
+
+        if self.iterations and self.completed_iterations >= self.iterations:
+            return False
+
+        if self.deadline and time.time() >= self.deadline:
+            return False
+
+        return True
+
+    def iterate_features(self, feature_locations):
+
+        while self.has_next_iteration():
+            features = parse_features(feature_locations, language=self.config.lang)
+
+            for feature in features:
+                yield feature
+
+            self.collect_samples(features)
+            self.completed_iterations += 1
+
+    def collect_samples(self, features):
+
+        for feature in features:
+
+            for scenario in feature.walk_scenarios():
+
+                for step in scenario.all_steps:
+                    status = step.status.name
+
+                    if status in ('passed', 'failed', 'error'):
+                        samples = self.step_samples.setdefault(f'{step.keyword} {step.name}', [])
+                        samples.append((step.duration, status == 'passed'))
+
+    def run_model(self, features=None):
+        feature_locations = [feature.filename for feature in (features or self.features)]
+
+        return super().run_model(features=self.iterate_features(feature_locations))
+
+
+def run_virtual_user(user_index, behave_args, start_delay, iterations, duration, results):
+    """This function runs the scenarios as one virtual user and puts its step timings on the results queue.
+
+    Args:
+        user_index (int): The number of the virtual user, available to the steps as "-D load_user".
+        behave_args (list): The command line arguments for behave. i.e. ['--tags', '@api', '-n', '2.3']
+        start_delay (float): The time in seconds to wait before starting, to ramp up the virtual users.
+        iterations (int): The number of times to run the scenarios, 0 to run until the duration has passed.
+        duration (float): The time in seconds to keep running the scenarios, 0 to run the iterations only.
+        results (Queue): The queue to put the results of the virtual user on.
+    """
+
+    time.sleep(start_delay)
+
+    command_args = behave_args + ['--format', 'null', '--no-summary', '--no-snippets', '-D', f'load_user={user_index}']
+    deadline = time.time() + duration if duration else 0
+
+    runner = None
+    error = None
+    started_at = time.time()
+
+    try:
+        runner = LoadTestRunner(Configuration(command_args=command_args), iterations, deadline)
+        runner.run()
+    except BaseException as exception:
+        error = f'{type(exception).__name__}: {exception}'
+    finally:
+        # The results are always reported, otherwise the load test would wait for a crashed virtual user.
+        results.put({'user': user_index, 'iterations': runner.completed_iterations if runner else 0,
+                     'elapsed': time.time() - started_at, 'steps': runner.step_samples if runner else {},
+                     'error': error})
+
+
+def get_percentile(sorted_values, percentile):
+    index = max(0, int(round(percentile / 100 * len(sorted_values))) - 1)
+    return sorted_values[index]
+
+
+def summarize_results(users_results, elapsed):
+    """This function merges the step timings of all the virtual users into throughput and latency percentiles.
+
+    Args:
+        users_results (list): The results of every virtual user.
+        elapsed (float): The wall time of the whole load test in seconds.
+
+    Returns:
+        summary (dict): The number of iterations and the statistics per step.
+    """
+
+    merged_samples = {}
+
+    for user_results in users_results:
+
+        for step_name, samples in user_results['steps'].items():
+            merged_samples.setdefault(step_name, []).extend(samples)
+
+    steps = {}
+
+    for step_name, samples in merged_samples.items():
+        durations = sorted(duration for duration, _ in samples)
+
+        step_summary = {
+            'count': len(samples),
+            'failures': sum(1 for _, passed in samples if not passed),
+            'throughput': len(samples) / elapsed if elapsed else 0.0,
+        }
+
+        for percentile in PERCENTILES:
+            step_summary[f'p{percentile}'] = get_percentile(durations, percentile)
+
+        steps[step_name] = step_summary
+
+    return {
+        'users': len(users_results),
+        'iterations': sum(user_results['iterations'] for user_results in users_results),
+        'elapsed': elapsed,
+        'steps': steps,
+        'errors': {user_results['user']: user_results['error'] for user_results in users_results
+                   if user_results['error'] or not user_results['iterations']},
+    }
+
+
+def print_summary(summary):
+    print(f'\nVirtual users: {summary["users"]} | Iterations: {summary["iterations"]} | '
+          f'Elapsed: {summary["elapsed"]:.2f}s\n')
+
+    print(f'{"Step":<90} {"Count":>7} {"Failed":>7} {"Per sec":>9} ' +
+          ' '.join(f'{"p" + str(percentile) + " (ms)":>10}' for percentile in PERCENTILES))
+
+    for step_name, step_summary in summary['steps'].items():
+        print(f'{step_name[:90]:<90} {step_summary["count"]:>7} {step_summary["failures"]:>7} '
+              f'{step_summary["throughput"]:>9.2f} ' +
+              ' '.join(f'{step_summary["p" + str(percentile)] * 1000:>10.1f}' for percentile in PERCENTILES))
+
+    for user_index, error in summary['errors'].items():
+        print(f'\nVirtual user {user_index} failed: {error or "no iteration was completed."}')
+
+
+def run_load_test(behave_args, users=1, ramp_up=0, iterations=0, duration=0):
+    """This function runs the scenarios selected by the behave arguments as a load test with virtual users.
+
+    Args:
+        behave_args (list): The command line arguments for behave. i.e. ['--tags', '@api', '-n', '2.3']
+        users (int): The number of virtual users running the scenarios at the same time.
+        ramp_up (float): The time in seconds over which the virtual users are started.
+        iterations (int): The number of times each virtual user runs the scenarios.
+        duration (float): The time in seconds each virtual user keeps running the scenarios.
+
+    Returns:
+        summary (dict): The throughput and latency percentiles per step.
+    """
+
+    if not iterations and not duration:
+        iterations = 1
+
+    # All the virtual users share one data seed, so the data factory partitions the usernames between them.
+    # The userdata is read like the virtual users read it, so a seed given in any form of -D or in behave.ini is kept.
+    if not Configuration(command_args=behave_args).userdata.get('data_seed'):
+        behave_args = behave_args + ['-D', f'data_seed={random.randrange(36 ** 6)}']
+
+    behave_args = behave_args + ['-D', f'workers={users}']
+
+    results = multiprocessing.Queue()
+    processes = []
+
+    started_at = time.time()
+
+    for user_index in range(users):
+        start_delay = ramp_up * user_index / users
+        process = multiprocessing.Process(target=run_virtual_user, name=f'virtual-user-{user_index}',
+                                          args=(user_index, behave_args, start_delay, iterations, duration, results))
+        process.start()
+        processes.append(process)
+
+    users_results = collect_results(results, processes)
+
+    for process in processes:
+        process.join()
+
+    return summarize_results(users_results, time.time() - started_at)
+
+
+def collect_results(results, processes):
+    """This function waits for the results of every virtual user, or until its process has died without any.
+
+    Results are collected before joining, a process does not exit while its queue data is not consumed.
+
+    Args:
+        results (Queue): The queue the virtual users put their results on.
+        processes (list): The processes of the virtual users, in the order of their index.
+
+    Returns:
+        users_results (list): The results of every virtual user, crashed ones with their exit code as error.
+    """
+
+    users_results = {}
+    last_try = False
+
+    while len(users_results) < len(processes):
+
+        try:
+            user_results = results.get(timeout=RESULTS_POLL_INTERVAL)
+            users_results[user_results['user']] = user_results
+        except queue.Empty:
+
+            if last_try:
+                break
+
+            # The results a process put right before it exited are still read by one more try.
+            last_try = not any(process.is_alive() for process in processes)
+
+    for user_index, process in enumerate(processes):
+
+        if user_index not in users_results:
+            process.join()
+            users_results[user_index] = {'user': user_index, 'iterations': 0, 'elapsed': 0.0, 'steps': {},
+                                         'error': f'The process exited with code {process.exitcode}.'}
+
+    return [users_results[user_index] for user_index in range(len(processes))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Runs behave scenarios as a load test. Run it from the features '
+                                                 'directory, every unknown argument is passed to behave.')
+    parser.add_argument('--users', type=int, default=1, help='Number of virtual users.')
+    parser.add_argument('--ramp-up', type=float, default=0, help='Seconds over which the virtual users are started.')
+    parser.add_argument('--iterations', type=int, default=0, help='Iterations per virtual user.')
+    parser.add_argument('--duration', type=float, default=0, help='Seconds each virtual user keeps running.')
+    parser.add_argument('--output', default='', help='Path of a JSON file to write the summary to.')
+    args, behave_args = parser.parse_known_args()
+
+    summary = run_load_test(behave_args, args.users, args.ramp_up, args.iterations, args.duration)
+
+    print_summary(summary)
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(summary, output_file, indent=2)
+
+    # A virtual user that crashed or ran no iteration fails the load test.
+    if summary['errors']:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
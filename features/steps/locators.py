@@ -0,0 +1,90 @@
+import logging
+import re
+from functools import lru_cache
+
+from selenium.webdriver.common.by import By
+
+from steps import constants
+
+logger = logging.getLogger('myLogger')
+
+# An XPath matching elements by a single attribute, which ID, NAME and CSS selectors resolve faster.
+# i.e. './/input[@name="username"]' or '//*[@id="customerForm"]'
+ATTRIBUTE_XPATH_PATTERN = re.compile(r'^\.?//(?P<tag>\*|[A-Za-z][\w-]*)\[@(?P<attr>[A-Za-z][\w-]*)='
+                                     r'(?P<quote>["\'])(?P<value>[^"\'\\]*)(?P=quote)\]$')
+
+
+@lru_cache(maxsize=1024)
+def compile_locator(xpath):
+    """This function picks the fastest strategy that finds the same elements as the XPath.
+
+    Args:
+        xpath (str): The XPath of the elements. i.e. './/input[@value="Register"]'
+
+    Returns:
+        locator (tuple): The strategy and the value for find_elements. i.e. ('css selector', 'input[value="Register"]')
+    """
+
+    match = ATTRIBUTE_XPATH_PATTERN.match(xpath)
+
+    if not match:
+        return By.XPATH, xpath
+
+    tag, attr, value = match.group('tag', 'attr', 'value')
+
+    if tag == '*' and attr == 'id' and value:
+        return By.ID, value
+
+    if tag == '*' and attr == 'name' and value:
+        return By.NAME, value
+
+    return By.CSS_SELECTOR, f'{tag}[{attr}="{value}"]'
+
+
+@lru_cache(maxsize=1024)
+def format_xpath(template, *args, _single_quotes=False):
+    """This function fills in an XPath template of constants once for every set of arguments.
+
+    Args:
+        template (str): The XPath template. i.e. FrontEndXpath.field_xpath.value
+        args (tuple): The values to fill in. i.e. 'First Name'
+        _single_quotes (bool): Use single quotes in the template, for values with double quotes.
+
+    Returns:
+        xpath (str): The XPath.
+    """
+
+    if _single_quotes:
+        template = template.replace('"', "'")
+
+    return template.format(*args)
+
+
+def format_text_xpath(elems_text, _exact_text=False):
+    """This function returns the XPath of the elements having the text, or having exactly the text.
+
+    Args:
+        elems_text (str): The visible text of the elements that we are looking for.
+        _exact_text (bool): This flag helps to decide whether an element has the exact text or contains the text.
+
+    Returns:
+        xpath (str): The XPath of the elements.
+    """
+
+    if _exact_text:
+        template = constants.FrontEndXpath.locate_elem_by_exact_text_xpath.value
+    else:
+        template = constants.FrontEndXpath.locate_elem_by_having_text_xpath.value
+
+    return format_xpath(template, elems_text, _single_quotes=True)
+
+
+def close():
+    """This function reports how often the compiled locators were reused."""
+
+    info = compile_locator.cache_info()
+    lookups = info.hits + info.misses
+
+    if lookups:
+        logger.debug(f'< Compiled locators | Hits: {info.hits} of {lookups} lookups ({info.hits / lookups:.0%}) | '
+                     f'Locators: {info.currsize}')
@@ -0,0 +1,64 @@
+from collections import ChainMap
+from collections.abc import Mapping
+from types import MappingProxyType
+
+from steps import constants
+
+
+class PayloadOverlay(ChainMap):
+    """This class is a payload made of the changes of a scenario on top of a read-only template.
+
+    Writes only ever go to the changes, so any number of overlays share the template without copying it.
+    """
+
+    def flatten(self):
+        return dict(self)
+
+    def __repr__(self):
+        return repr(self.flatten())
+
+
+class PayloadTemplate:
+    """This class is an immutable base payload that scenarios derive their payloads from.
+
+    Args:
+        base (dict): The fields of the payload. i.e. ApiConstant.register_customer_payload.value
+    """
+
+    __slots__ = ('base',)
+
+    def __init__(self, base):
+        self.base = MappingProxyType(dict(base))
+
+    def overlay(self, _overrides=None, **overrides):
+        """This function derives a payload from the template without copying the template.
+
+        Args:
+            _overrides (dict): The fields to change, for field names that are not valid keywords.
+            overrides (dict): The fields to change. i.e. inputString='admin'
+
+        Returns:
+            payload (PayloadOverlay): The payload, flattened to a dict only when it is sent.
+        """
+
+        return PayloadOverlay({**(_overrides or {}), **overrides}, self.base)
+
+
+def flatten(payload):
+    """This function turns a payload into the plain value that is encoded for the wire.
+
+    Args:
+        payload (Any): The payload of a request. i.e. a PayloadOverlay, a dict or 'username=abc&password=xyz'
+
+    Returns:
+        payload (Any): A dict for any mapping, anything else is returned as it is.
+    """
+
+    if isinstance(payload, Mapping) and not isinstance(payload, dict):
+        return dict(payload)
+
+    return payload
+
+
+register_customer = PayloadTemplate(constants.ApiConstant.register_customer_payload.value)
+hash_generating = PayloadTemplate(constants.ApiConstant.hash_generating_payload.value)
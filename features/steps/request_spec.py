@@ -0,0 +1,161 @@
+import json
+from collections.abc import Mapping
+from enum import Enum
+from types import MappingProxyType, SimpleNamespace
+
+from steps import constants, payload_templates
+
+FORM_HEADERS = MappingProxyType({"Content-Type": "application/x-www-form-urlencoded"})
+
+
+class BodyType(Enum):
+    form = 'form'              # A dict is url-encoded, a string is expected to be url-encoded already.
+    json = 'json'              # The payload is sent as a JSON document.
+    multipart = 'multipart'    # The payload is sent as form fields along with the files.
+    raw = 'raw'                # The payload is sent as it is.
+
+
+def infer_body_type(payload, files):
+    """This function chooses the body type of a payload when the request does not set one.
+
+    A dict or any other mapping is sent as a JSON document like it always was, strings are sent as they are.
+    """
+
+    if files:
+        return BodyType.multipart
+
+    if isinstance(payload, Mapping) and payload:
+        return BodyType.json
+
+    return BodyType.raw
+
+
+class RequestSpec:
+    """This class holds everything that makes up a request, so it is built and encoded exactly once.
+
+    Args:
+        method (str): CRUD operation being used while making the request.
+        endpoint (str): The endpoint of the request, with or without the server.
+        headers (dict): The headers of the request.
+        payload (Any): The payload of the request. i.e. {'username': 'abc'} or 'username=abc&password=xyz'
+        files (list): The files of a multipart request.
+        allow_redirects (bool): Whether the redirects of the response are followed.
+        body_type (BodyType): The encoding of the payload, inferred from the payload if None.
+        cacheable (bool): Whether the response may be served from the HTTP cache.
+    """
+
+    __slots__ = ('method', 'endpoint', 'headers', 'payload', 'files', 'allow_redirects', 'body_type', 'cacheable')
+
+    def __init__(self, method='GET', endpoint='', headers=None, payload=None, files=None, allow_redirects=True,
+                 body_type=None, cacheable=False):
+        self.method = method.upper()
+        self.endpoint = endpoint
+        self.headers = headers or {}
+        self.payload = payload
+        self.files = files or []
+        self.allow_redirects = allow_redirects
+        self.body_type = BodyType(body_type) if body_type else infer_body_type(payload, files)
+        self.cacheable = cacheable
+
+    def replace(self, **changes):
+        """This function returns a copy of the spec with some of its attributes changed.
+
+        Args:
+            changes (dict): The attributes to change. i.e. payload='username=abc&password=xyz'
+
+        Returns:
+            spec (RequestSpec): The changed copy, the spec itself is left untouched.
+        """
+
+        attrs = {attr: getattr(self, attr) for attr in self.__slots__}
+        attrs['headers'] = dict(attrs['headers'])
+
+        if 'body_type' not in changes and ('payload' in changes or 'files' in changes):
+            # The body type of a template follows the new payload unless the template fixes it.
+            attrs['body_type'] = None if self.body_type is infer_body_type(self.payload, self.files) else \
+                self.body_type
+
+        attrs.update(changes)
+
+        return RequestSpec(**attrs)
+
+    def with_session_id(self, session_id):
+        """This function returns a copy of the spec that uses the session in its endpoint and its cookie header.
+
+        Args:
+            session_id (str): The JSESSIONID of the session.
+
+        Returns:
+            spec (RequestSpec): The changed copy, the spec itself is left untouched.
+        """
+
+        return self.replace(endpoint=self.endpoint.format(session_id),
+                            headers={**self.headers, "Cookie": f"JSESSIONID={session_id}"})
+
+    def encode(self):
+        """This function encodes the body of the request for requests.Session.request.
+
+        Returns:
+            kwargs (dict): The headers, body and redirect arguments of the request.
+        """
+
+        kwargs = {'headers': self.headers or None, 'allow_redirects': self.allow_redirects}
+
+        # Payload templates and their overlays only become a plain dict here.
+        payload = payload_templates.flatten(self.payload)
+
+        if self.body_type is BodyType.multipart:
+            kwargs['data'] = payload or None
+            kwargs['files'] = self.files
+        elif self.body_type is BodyType.json:
+            kwargs['data'] = json.dumps(payload)
+        else:
+            kwargs['data'] = payload or None
+
+        return kwargs
+
+    def to_job(self, config):
+        """This function turns the spec into a request job that can be passed to utils.make_request.
+
+        Args:
+            config (Configuration): The behave configuration holding the server.
+
+        Returns:
+            job (SimpleNamespace): The request job.
+        """
+
+        return SimpleNamespace(config=config, request_spec=self)
+
+
+# Templates of the routes of Parabank, the steps and the account pool fill in copies of them with the session and
+# payload. The register and login forms are url-encoded to match their Content-Type, which is what Parabank binds.
+ROUTE_SPECS = MappingProxyType({
+    constants.ApiEndpoint.homepage_endpoint:
+        RequestSpec('GET', constants.ApiEndpoint.homepage_endpoint.value),
+    constants.ApiEndpoint.register_customer_with_session_id_endpoint:
+        RequestSpec('GET', constants.ApiEndpoint.register_customer_with_session_id_endpoint.value),
+    constants.ApiEndpoint.register_customer_endpoint:
+        RequestSpec('POST', constants.ApiEndpoint.register_customer_endpoint.value, dict(FORM_HEADERS),
+                    body_type=BodyType.form),
+    constants.ApiEndpoint.login_endpoint:
+        RequestSpec('POST', constants.ApiEndpoint.login_endpoint.value, dict(FORM_HEADERS), allow_redirects=False,
+                    body_type=BodyType.form),
+    constants.ApiEndpoint.overview_endpoint:
+        RequestSpec('GET', constants.ApiEndpoint.overview_endpoint.value),
+    constants.ApiEndpoint.logout_endpoint:
+        RequestSpec('GET', constants.ApiEndpoint.logout_endpoint.value, allow_redirects=False),
+})
+
+
+def get_route_spec(endpoint):
+    """This function returns the spec of a Parabank route.
+
+    Args:
+        endpoint (ApiEndpoint): The route. i.e. ApiEndpoint.login_endpoint
+
+    Returns:
+        spec (RequestSpec): A copy of the template of the route with its own headers, changing it leaves ROUTE_SPECS
+                            untouched.
+    """
+
+    return ROUTE_SPECS[endpoint].replace()
@@ -0,0 +1,241 @@
+import logging
+import random
+import threading
+import time
+
+import requests
+
+logger = logging.getLogger('myLogger')
+
+# Responses of an overloaded server that are worth retrying, a 500 is an answer the scenarios may expect.
+RETRY_STATUS_CODES = (502, 503, 504)
+
+# Only requests without side effects on the server are retried.
+IDEMPOTENT_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+BREAKER_ACTIONS = ('skip', 'fail')
+
+
+class CircuitOpenError(AssertionError):
+    """This exception is raised instead of sending a request while the circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """This class stops sending requests to a server that keeps failing, for the whole run.
+
+    After failure_threshold transport failures in a row the breaker opens and every request fails immediately.
+    Once reset_timeout has passed a single trial request is let through, which closes the breaker if it succeeds.
+
+    Args:
+        failure_threshold (int): The number of consecutive failures that opens the breaker.
+        reset_timeout (float): The time in seconds the breaker stays open before the trial request.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self.failures = 0
+        self.opened_at = None
+        self.last_error = None
+        self.trips = 0
+
+        self._lock = threading.Lock()
+        self._trial_running = False
+
+    def is_open(self):
+
+        with self._lock:
+            return self.opened_at is not None and time.monotonic() - self.opened_at < self.reset_timeout
+
+    def get_reason(self):
+        return f'The circuit breaker is open after {self.failures} failed requests in a row: {self.last_error}'
+
+    def before_request(self):
+        """This function lets a request through unless the breaker is open.
+
+        Raises:
+            CircuitOpenError: An exception arises if the breaker is open or its trial request is still running.
+        """
+
+        with self._lock:
+
+            if self.opened_at is None:
+                return
+
+            if time.monotonic() - self.opened_at < self.reset_timeout or self._trial_running:
+                raise CircuitOpenError(self.get_reason())
+
+            self._trial_running = True
+
+    def record_success(self):
+
+        with self._lock:
+
+            if self.opened_at is not None:
+                logger.debug('The circuit breaker is closed again.')
+
+            self.failures = 0
+            self.opened_at = None
+            self._trial_running = False
+
+    def record_failure(self, error):
+
+        with self._lock:
+            self.failures += 1
+            self.last_error = error
+
+            if self._trial_running or (self.opened_at is None and self.failures >= self.failure_threshold):
+                self.opened_at = time.monotonic()
+                self.trips += 1
+                logger.debug(self.get_reason())
+
+            self._trial_running = False
+
+
+_settings = {
+    'request_timeout': 10.0,
+    'scenario_timeout': 120.0,
+    'get_retries': 2,
+    'retry_backoff': 0.2,
+    'breaker_action': 'skip',
+}
+
+breaker = CircuitBreaker()
+
+
+def configure(context):
+    """This function reads the deadlines, retries and circuit breaker settings from behave.ini.
+
+    Args:
+        context (Context): The default object is available throughout Behave framework.
+    """
+
+    userdata = context.config.userdata
+
+    _settings['request_timeout'] = float(userdata.get('REQUEST_TIMEOUT', _settings['request_timeout']))
+    _settings['scenario_timeout'] = float(userdata.get('SCENARIO_TIMEOUT', _settings['scenario_timeout']))
+    _settings['get_retries'] = int(userdata.get('GET_RETRIES', _settings['get_retries']))
+    _settings['retry_backoff'] = float(userdata.get('RETRY_BACKOFF', _settings['retry_backoff']))
+    _settings['breaker_action'] = userdata.get('BREAKER_ACTION', _settings['breaker_action']).lower()
+
+    if _settings['breaker_action'] not in BREAKER_ACTIONS:
+        raise AssertionError(f'BREAKER_ACTION should be one of {BREAKER_ACTIONS}, got "{_settings["breaker_action"]}".')
+
+    breaker.failure_threshold = int(userdata.get('BREAKER_FAILURE_THRESHOLD', breaker.failure_threshold))
+    breaker.reset_timeout = float(userdata.get('BREAKER_RESET_TIMEOUT', breaker.reset_timeout))
+
+    logger.debug(f'Request resilience settings: {_settings} | Breaker threshold: {breaker.failure_threshold} | '
+                 f'Breaker reset: {breaker.reset_timeout}s')
+
+
+def start_scenario(context, scenario):
+    """This function sets the deadline of the scenario and stops it right away if the circuit breaker is open.
+
+    Args:
+        context (Context): The default object is available throughout Behave framework.
+        scenario (Scenario): The scenario about to be executed.
+
+    Raises:
+        CircuitOpenError: An exception arises if the breaker is open and BREAKER_ACTION is "fail".
+    """
+
+    if breaker.is_open():
+
+        if _settings['breaker_action'] == 'fail':
+            raise CircuitOpenError(breaker.get_reason())
+
+        scenario.skip(reason=breaker.get_reason())
+
+        return
+
+    context.scenario_deadline = time.monotonic() + _settings['scenario_timeout']
+
+
+def get_timeout(deadline):
+    """This function returns the timeout of the next request, the request timeout capped by the scenario deadline.
+
+    Args:
+        deadline (float): The time.monotonic value the scenario has to finish by, None if it has no deadline.
+
+    Raises:
+        AssertionError: An exception arises if the deadline of the scenario has passed.
+
+    Returns:
+        timeout (float): The time in seconds the request may take.
+    """
+
+    if deadline is None:
+        return _settings['request_timeout']
+
+    remaining = deadline - time.monotonic()
+
+    if remaining <= 0:
+        raise AssertionError(f'The scenario exceeded its deadline of {_settings["scenario_timeout"]} seconds.')
+
+    return min(_settings['request_timeout'], remaining)
+
+
+def get_backoff(attempt):
+    # Full jitter keeps the retries of the parallel workers from hitting the server at the same moment.
+    return random.uniform(0, _settings['retry_backoff'] * 2 ** attempt)
+
+
+def send(send_request, method, _deadline=None):
+    """This function sends a request through the circuit breaker, within its deadline, retrying idempotent requests.
+
+    Args:
+        send_request (Callable): The function that sends the request with the given timeout and returns the response.
+        method (str): CRUD operation being used while making the request.
+        _deadline (float): The time.monotonic value the scenario has to finish by, None if it has no deadline.
+
+    Raises:
+        AssertionError: An exception arises if any of the following situations occur:
+                        1) if the circuit breaker is open.
+                        2) if the scenario deadline has passed.
+                        3) if the request still fails to reach the server after its retries.
+
+    Returns:
+        response (Response): The response of the request.
+    """
+
+    retries = _settings['get_retries'] if method.upper() in IDEMPOTENT_METHODS else 0
+
+    for attempt in range(retries + 1):
+        breaker.before_request()
+        timeout = get_timeout(_deadline)
+
+        try:
+            response = send_request(timeout)
+        except (requests.ConnectionError, requests.Timeout) as error:
+            breaker.record_failure(error)
+
+            if attempt == retries:
+                raise AssertionError(f'Unable to reach the server after {attempt + 1} attempts: {error}') from error
+
+            logger.debug(f'Retrying "{method}" request after: {error}')
+        else:
+
+            if response.status_code not in RETRY_STATUS_CODES:
+                breaker.record_success()
+                return response
+
+            breaker.record_failure(f'Status code {response.status_code}')
+
+            if attempt == retries:
+                return response
+
+            logger.debug(f'Retrying "{method}" request after status code {response.status_code}.')
+
+        delay = get_backoff(attempt)
+
+        if _deadline is not None:
+            delay = min(delay, max(0.0, _deadline - time.monotonic()))
+
+        time.sleep(delay)
+
+
+def close():
+
+    if breaker.trips:
+        logger.debug(f'< The circuit breaker tripped {breaker.trips} times during the run.')
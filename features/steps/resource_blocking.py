@@ -0,0 +1,162 @@
+import fnmatch
+import json
+import logging
+import threading
+
+import selenium.common.exceptions as exceptions
+
+logger = logging.getLogger('myLogger')
+
+# Images, fonts and analytics, none of which the steps assert on.
+DEFAULT_BLOCKED_URLS = ('*.png', '*.jpg', '*.jpeg', '*.gif', '*.svg', '*.ico', '*.woff', '*.woff2', '*.ttf',
+                        '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*')
+
+# The reason DevTools gives for requests blocked by Network.setBlockedURLs.
+BLOCKED_REASON = 'inspector'
+
+
+def parse_patterns(value):
+    return tuple(pattern.strip() for pattern in value.split(',') if pattern.strip())
+
+
+class ResourceCounters:
+    """This class adds up the network activity of the browsers, read from their performance logs."""
+
+    def __init__(self):
+        self.requests = 0
+        self.blocked = 0
+        self.bytes_loaded = 0
+
+        self._lock = threading.Lock()
+
+    def add_log(self, entries):
+        """This function counts the requests of the DevTools events in the performance log of a browser.
+
+        Args:
+            entries (list): The entries of the performance log, each holding a DevTools event as JSON.
+        """
+
+        requests = blocked = bytes_loaded = 0
+
+        for entry in entries:
+
+            try:
+                event = json.loads(entry['message'])['message']
+            except (KeyError, ValueError):
+                continue
+
+            method = event.get('method')
+            params = event.get('params', {})
+
+            if method == 'Network.requestWillBeSent':
+                requests += 1
+            elif method == 'Network.loadingFailed' and params.get('blockedReason') == BLOCKED_REASON:
+                blocked += 1
+            elif method == 'Network.loadingFinished':
+                bytes_loaded += params.get('encodedDataLength', 0)
+
+        with self._lock:
+            self.requests += requests
+            self.blocked += blocked
+            self.bytes_loaded += bytes_loaded
+
+
+_settings = {'enabled': False, 'blocked_urls': DEFAULT_BLOCKED_URLS}
+
+counters = ResourceCounters()
+
+
+def configure(context):
+    """This function reads the resource blocking settings from behave.ini.
+
+    Args:
+        context (Context): The default object is available throughout Behave framework.
+    """
+
+    userdata = context.config.userdata
+
+    _settings['enabled'] = str(userdata.get('RESOURCE_BLOCKING', 'false')).lower() == 'true'
+
+    if 'BLOCKED_URLS' in userdata:
+        _settings['blocked_urls'] = parse_patterns(userdata['BLOCKED_URLS'])
+
+
+def is_enabled():
+    return _settings['enabled']
+
+
+def get_blocked_urls(context, tags):
+    """This function returns the URL patterns to block for the tags of a scenario.
+
+    Every tag can add patterns with "BLOCKED_URLS_<tag>" and let patterns through with "ALLOWED_URLS_<tag>".
+    An allowed pattern removes every blocked pattern it matches. i.e. "ALLOWED_URLS_images = *.png, *.jpg"
+
+    Args:
+        context (Context): The default object is available throughout Behave framework.
+        tags (list): The tags of the feature and the scenario.
+
+    Returns:
+        blocked_urls (list): The URL patterns for Network.setBlockedURLs.
+    """
+
+    userdata = context.config.userdata
+    blocked_urls = list(_settings['blocked_urls'])
+    allowed_urls = []
+
+    for tag in tags:
+        blocked_urls.extend(parse_patterns(userdata.get(f'BLOCKED_URLS_{tag}', '')))
+        allowed_urls.extend(parse_patterns(userdata.get(f'ALLOWED_URLS_{tag}', '')))
+
+    return [pattern for pattern in dict.fromkeys(blocked_urls)
+            if not any(fnmatch.fnmatchcase(pattern, allowed_url) for allowed_url in allowed_urls)]
+
+
+def apply(context, tags):
+    """This function blocks the resources the scenario does not need in its browser.
+
+    Args:
+        context (Context): The default object is available throughout Behave framework.
+        tags (list): The tags of the feature and the scenario.
+    """
+
+    if not is_enabled():
+        return
+
+    blocked_urls = get_blocked_urls(context, tags)
+
+    try:
+        context.browser.execute_cdp_cmd('Network.enable', {})
+        context.browser.execute_cdp_cmd('Network.setBlockedURLs', {'urls': blocked_urls})
+    except (AttributeError, exceptions.WebDriverException) as error:
+        logger.debug(f'Unable to block resources in the browser: {error}')
+        return
+
+    logger.debug(f'Blocking {len(blocked_urls)} URL patterns in the browser.')
+
+
+def collect(context):
+    """This function counts the requests made and blocked by the browser of the scenario.
+
+    Reading the performance log also empties it, so every request is counted once.
+
+    Args:
+        context (Context): The default object is available throughout Behave framework.
+    """
+
+    if not is_enabled():
+        return
+
+    try:
+        counters.add_log(context.browser.get_log('performance'))
+    except (AttributeError, exceptions.WebDriverException) as error:
+        logger.debug(f'Unable to read the performance log of the browser: {error}')
+
+
+def close():
+    """This function reports the requests blocked during the run."""
+
+    if not is_enabled():
+        return
+
+    logger.debug(f'< Resource blocking | Requests: {counters.requests} | Blocked: {counters.blocked} | '
+                 f'Bytes loaded: {counters.bytes_loaded}')
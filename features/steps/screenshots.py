@@ -0,0 +1,243 @@
+import base64
+import hashlib
+import io
+import logging
+import os
+import queue
+import re
+import threading
+import time
+
+from selenium.webdriver.common.by import By
+
+from steps import constants
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+logger = logging.getLogger('myLogger')
+
+SCREENSHOT_EXTENSIONS = ('.png', '.jpg')
+
+
+def get_file_name(scenario_name, step_line, digest):
+    """This function returns a file name that no other scenario or step of the run can collide with.
+
+    Args:
+        scenario_name (str): The name of the scenario.
+        step_line (int): The line of the failed step in the feature file.
+        digest (str): The sha256 hex digest of the screenshot.
+
+    Returns:
+        file_name (str): The file name without extension. i.e. 'Register_a_customer-L12-3fa2c9e1'
+    """
+
+    safe_name = re.sub(r'[^\w-]+', '_', scenario_name).strip('_')[:100]
+
+    return f'{safe_name}-L{step_line}-{digest[:8]}'
+
+
+def compress(png, quality):
+    """This function re-encodes a PNG screenshot as a JPEG of the given quality.
+
+    Args:
+        png (bytes): The PNG screenshot.
+        quality (int): The JPEG quality from 1 to 95, 0 keeps the lossless PNG.
+
+    Returns:
+        image (tuple): The encoded image and its extension. i.e. (b'...', '.jpg')
+    """
+
+    if not quality or Image is None:
+        return png, '.png'
+
+    buffer = io.BytesIO()
+    Image.open(io.BytesIO(png)).convert('RGB').save(buffer, 'JPEG', quality=quality, optimize=True)
+
+    return buffer.getvalue(), '.jpg'
+
+
+class ScreenshotWriter:
+    """This class decodes, deduplicates, compresses and writes the screenshots on a background thread.
+
+    The test thread only captures the screenshot and hands it over. When the queue is full the screenshot is dropped
+    instead of stalling the run. Once the directory grows beyond the disk budget the oldest screenshots are removed.
+
+    Args:
+        directory (str): The directory of the screenshots.
+        max_queue (int): The number of screenshots waiting to be written.
+        disk_budget (int): The size in bytes the screenshots may take, 0 for no limit.
+        quality (int): The JPEG quality of the screenshots, 0 to keep them as lossless PNG.
+    """
+
+    def __init__(self, directory, max_queue=16, disk_budget=0, quality=0):
+        self.directory = directory
+        self.disk_budget = disk_budget
+        self.quality = quality
+
+        self.written = 0
+        self.duplicates = 0
+        self.dropped = 0
+        self.evicted = 0
+
+        self._queue = queue.Queue(maxsize=max(1, max_queue))
+        self._digests = {}
+        self._files = []
+        self._disk_usage = 0
+        self._thread = threading.Thread(target=self._run, name='screenshot-writer', daemon=True)
+
+        if Image is None and quality:
+            logger.debug('Pillow is not installed, the screenshots are kept as PNG.')
+
+        os.makedirs(directory, exist_ok=True)
+        self._scan()
+        self._thread.start()
+
+    def _scan(self):
+        # Screenshots of earlier runs count towards the disk budget and are the first to be evicted.
+        for entry in os.scandir(self.directory):
+
+            if entry.is_file() and entry.name.endswith(SCREENSHOT_EXTENSIONS):
+                stat = entry.stat()
+                self._files.append((stat.st_mtime, entry.path, stat.st_size))
+
+        self._files.sort()
+        self._disk_usage = sum(size for _, _, size in self._files)
+
+    def submit(self, scenario_name, step_line, screenshot):
+        """This function queues a screenshot for writing without waiting for the disk.
+
+        Args:
+            scenario_name (str): The name of the scenario.
+            step_line (int): The line of the failed step in the feature file.
+            screenshot (str): The base64 encoded PNG screenshot.
+
+        Returns:
+            queued (bool): Whether the screenshot was queued, False if the queue is full.
+        """
+
+        try:
+            self._queue.put_nowait((scenario_name, step_line, screenshot))
+            return True
+        except queue.Full:
+            self.dropped += 1
+            logger.debug(f'Dropped the screenshot of "{scenario_name}", the screenshot queue is full.')
+            return False
+
+    def _run(self):
+
+        while True:
+            item = self._queue.get()
+
+            try:
+                if item is None:
+                    return
+
+                self.write(*item)
+            except Exception as error:
+                logger.debug(f'Unable to write the screenshot of "{item[0]}": {error}')
+            finally:
+                self._queue.task_done()
+
+    def write(self, scenario_name, step_line, screenshot):
+        png = base64.b64decode(screenshot)
+        digest = hashlib.sha256(png).hexdigest()
+
+        if digest in self._digests and os.path.exists(self._digests[digest]):
+            self.duplicates += 1
+            logger.debug(f'The screenshot of "{scenario_name}" is identical to {self._digests[digest]}')
+            return
+
+        image, extension = compress(png, self.quality)
+        file_path = os.path.join(self.directory, get_file_name(scenario_name, step_line, digest) + extension)
+
+        with open(file_path, 'wb') as file:
+            file.write(image)
+
+        self._digests[digest] = file_path
+        self._files.append((time.time(), file_path, len(image)))
+        self._disk_usage += len(image)
+        self.written += 1
+
+        logger.debug(f'Saved the screenshot of "{scenario_name}" to {file_path}')
+
+        self.evict()
+
+    def evict(self):
+        """This function removes the oldest screenshots until the directory fits the disk budget again."""
+
+        # The screenshot just written is kept even if it alone exceeds the budget.
+        while self.disk_budget and self._disk_usage > self.disk_budget and len(self._files) > 1:
+            _, file_path, size = self._files.pop(0)
+            self._disk_usage -= size
+
+            try:
+                os.remove(file_path)
+                self.evicted += 1
+            except OSError:
+                pass
+
+    def close(self, _timeout=30):
+        """This function writes the queued screenshots and stops the writer thread."""
+
+        try:
+            self._queue.put(None, timeout=_timeout)
+        except queue.Full:
+            return
+
+        self._thread.join(_timeout)
+
+
+_state = {'writer': None}
+
+
+def get_writer(context):
+    """This function returns the screenshot writer of the run and starts it on the first call.
+
+    Args:
+        context (Context): The default object is available throughout Behave framework.
+
+    Returns:
+        writer (ScreenshotWriter): The screenshot writer configured in behave.ini.
+    """
+
+    if _state['writer'] is None:
+        userdata = context.config.userdata
+
+        _state['writer'] = ScreenshotWriter(str(constants.BackOfficeConstant.screenshots_dir_path.value),
+                                            int(userdata.get('SCREENSHOT_QUEUE_SIZE', 16)),
+                                            int(float(userdata.get('SCREENSHOT_DISK_BUDGET_MB', 200)) * 1024 ** 2),
+                                            int(userdata.get('SCREENSHOT_QUALITY', 0)))
+
+    return _state['writer']
+
+
+def save_screenshot(context, step):
+    """This function captures the page of a failed step and leaves the writing to the screenshot writer.
+
+    Args:
+        context (Context): The default object is available throughout Behave framework.
+        step (Step): The failed step.
+    """
+
+    # Only the capture has to happen on the test thread, while the browser still shows the failure.
+    screenshot = context.browser.find_element(By.CSS_SELECTOR, 'body').screenshot_as_base64
+
+    get_writer(context).submit(context.scenario.name, step.line, screenshot)
+
+
+def close():
+    """This function waits for the queued screenshots to be written."""
+
+    writer = _state['writer']
+
+    if writer is None:
+        return
+
+    writer.close()
+    _state['writer'] = None
+
+    logger.debug(f'< Closed the screenshot writer | Written: {writer.written} | Duplicates: {writer.duplicates} | '
+                 f'Dropped: {writer.dropped} | Evicted: {writer.evicted}')
@@ -0,0 +1,241 @@
+import logging
+import threading
+import time
+from collections import deque
+from steps import constants, request_spec, utils
+
+logger = logging.getLogger('myLogger')
+
+SESSION_KEY = 'JSESSIONID'
+
+# Scenarios with this tag always create their own session.
+ISOLATED_SESSION_TAG = 'isolated_session'
+
+# Share of the TTL after which an idle session is replaced by the background refresh.
+REFRESH_THRESHOLD = 0.8
+
+
+class SessionToken:
+    """This class is a JSESSIONID obtained from the homepage along with what is known about its server-side state."""
+
+    def __init__(self, session_id):
+        self.session_id = session_id
+        self.last_used_at = time.time()
+
+        # Visiting the registration page prepares the session for a registration request.
+        self.registration_page_visited = False
+
+        # A session which was used to register, login or logout is not handed out again.
+        self.tainted = False
+
+    def get_idle_time(self):
+        return time.time() - self.last_used_at
+
+    def is_valid(self, ttl):
+        return not self.tainted and self.get_idle_time() < ttl
+
+
+class SessionTokenCache:
+    """This class keeps a pool of idle sessions and refills it in the background.
+
+    Args:
+        fetch_session_id (Callable): The function that visits the homepage and returns the new JSESSIONID.
+        size (int): The number of idle sessions to keep ready.
+        ttl (float): The time in seconds a session can stay idle before the server may expire it.
+    """
+
+    def __init__(self, fetch_session_id, size=4, ttl=600):
+        self.fetch_session_id = fetch_session_id
+        self.size = size
+        self.ttl = ttl
+
+        self.hits = 0
+        self.misses = 0
+
+        self._idle_tokens = deque()
+        self._condition = threading.Condition()
+        self._stopped = False
+        self._refresh_thread = threading.Thread(target=self._refresh, name='session-cache-refresh', daemon=True)
+
+    def start(self):
+        self._refresh_thread.start()
+
+    def stop(self):
+
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+
+        self._refresh_thread.join(timeout=5)
+
+    def lease(self):
+        """This function hands out a valid idle session, or visits the homepage for a new one if none is ready.
+
+        Returns:
+            token (SessionToken): The session leased to the scenario until it is released.
+        """
+
+        with self._condition:
+
+            while self._idle_tokens:
+                token = self._idle_tokens.popleft()
+
+                if token.is_valid(self.ttl * REFRESH_THRESHOLD):
+                    self.hits += 1
+                    self._condition.notify_all()
+
+                    return token
+
+            self.misses += 1
+            self._condition.notify_all()
+
+        return SessionToken(self.fetch_session_id())
+
+    def release(self, token, reusable=True):
+
+        if not reusable or not token.is_valid(self.ttl):
+            return
+
+        token.last_used_at = time.time()
+
+        with self._condition:
+            self._idle_tokens.append(token)
+            self._condition.notify_all()
+
+    def _refresh(self):
+
+        while True:
+
+            with self._condition:
+
+                if self._stopped:
+                    return
+
+                # Sessions close to their expiry are dropped, so the refresh replaces them with new ones.
+                valid_tokens = [token for token in self._idle_tokens if token.is_valid(self.ttl * REFRESH_THRESHOLD)]
+                self._idle_tokens = deque(valid_tokens)
+
+                if len(self._idle_tokens) >= self.size:
+                    self._condition.wait(timeout=self.ttl * (1 - REFRESH_THRESHOLD))
+                    continue
+
+            try:
+                token = SessionToken(self.fetch_session_id())
+            except Exception as error:
+                logger.debug(f'Unable to refresh the session cache: {error}')
+
+                with self._condition:
+                    self._condition.wait(timeout=5)
+
+                continue
+
+            with self._condition:
+                self._idle_tokens.append(token)
+
+
+_state = {'cache': None}
+
+
+def configure(context):
+    """This function starts the session cache if it is enabled in behave.ini.
+
+    Args:
+        context (Context): The default object is available throughout Behave framework.
+    """
+
+    if str(utils.get_value_from_ini(context, utils.ConfigVars.session_cache.value, 'false')).lower() != 'true':
+        return
+
+    config = context.config
+
+    def fetch_session_id():
+        request_job = request_spec.get_route_spec(constants.ApiEndpoint.homepage_endpoint).to_job(config)
+        utils.make_request(request_job, 'GET', 200)
+
+        session_id = request_job.response.cookies.get(SESSION_KEY)
+
+        if not session_id:
+            raise AssertionError(f'The homepage did not return a "{SESSION_KEY}".')
+
+        return session_id
+
+    cache = SessionTokenCache(fetch_session_id,
+                              int(utils.get_value_from_ini(context, utils.ConfigVars.session_cache_size.value, 4)),
+                              float(utils.get_value_from_ini(context, utils.ConfigVars.session_cache_ttl.value, 600)))
+    cache.start()
+
+    _state['cache'] = cache
+
+    logger.debug('--- Started the session cache. ---')
+
+
+def lease_session(context):
+    """This function sets "context.session_id" to a cached session unless the scenario needs an isolated session.
+
+    Args:
+        context (Context): The default object is available throughout Behave framework.
+
+    Returns:
+        token (SessionToken): The leased session, or None if the scenario has to visit the homepage itself.
+    """
+
+    cache = _state['cache']
+
+    if cache is None or ISOLATED_SESSION_TAG in context.scenario.effective_tags:
+        return None
+
+    if not hasattr(context, 'session_lease'):
+        context.session_lease = cache.lease()
+
+    context.session_id = context.session_lease.session_id
+    logger.debug(f'Leased "{SESSION_KEY}" "{context.session_id}" from the session cache.')
+
+    return context.session_lease
+
+
+def track_request(context, request_type):
+    """This function marks the leased session as used up if the request changes its state on the server.
+
+    Args:
+        context (Context): The default object is available throughout Behave framework.
+        request_type (str): CRUD operation being used while making the request.
+    """
+
+    token = getattr(context, 'session_lease', None)
+
+    if token is None:
+        return
+
+    if request_type.upper() != 'GET' or constants.ApiEndpoint.logout_endpoint.value in context.request_spec.endpoint:
+        token.tainted = True
+
+
+def release_session(context, scenario):
+    """This function returns the leased session of the scenario to the cache if it can be reused.
+
+    Args:
+        context (Context): The default object is available throughout Behave framework.
+        scenario (Scenario): The scenario that has been executed.
+    """
+
+    cache = _state['cache']
+    token = getattr(context, 'session_lease', None)
+
+    if cache is None or token is None:
+        return
+
+    cache.release(token, reusable=scenario.status.name == 'passed')
+
+
+def close():
+    """This function stops the background refresh of the session cache."""
+
+    cache = _state['cache']
+
+    if cache is None:
+        return
+
+    cache.stop()
+    _state['cache'] = None
+
+    logger.debug(f'< Closed the session cache | Hits: {cache.hits} | Misses: {cache.misses}')
@@ -0,0 +1,103 @@
+import logging
+from urllib.parse import urlsplit
+
+import selenium.common.exceptions as exceptions
+
+from steps import account_pool, constants, data_factory, request_spec, utils
+
+logger = logging.getLogger('myLogger')
+
+# A page of the server that is cheap to load and starts no session, WebDriver only sets cookies of the page shown.
+NEUTRAL_PATH = '/robots.txt'
+
+
+def login_session(config, username, password):
+    """This function logs a customer in through the request pipeline of the API steps.
+
+    Args:
+        config (Configuration): The behave configuration holding the server.
+        username (str): The username of the customer.
+        password (str): The password of the customer.
+
+    Raises:
+        AssertionError: An exception arises if any of the following situations occur:
+                        1) if the server did not set a JSESSIONID.
+                        2) if the server did not redirect the customer after the login.
+
+    Returns:
+        session_cookie (Cookie): The JSESSIONID cookie the customer is logged in on.
+    """
+
+    homepage_job = request_spec.get_route_spec(constants.ApiEndpoint.homepage_endpoint).to_job(config)
+    utils.make_request(homepage_job, 'GET', 200)
+    session_cookie = account_pool.get_session_cookie(homepage_job.response)
+
+    login_spec = request_spec.get_route_spec(constants.ApiEndpoint.login_endpoint)
+    login_job = login_spec.with_session_id(session_cookie.value).replace(payload={'username': username,
+                                                                                  'password': password}).to_job(config)
+    utils.make_request(login_job, 'POST', 302)
+
+    return session_cookie
+
+
+def hand_off_session(context, session_cookie, url):
+    """This function hands a session of the API requests over to the browser and opens the page with it.
+
+    Args:
+        context (Context): The default object is available throughout Behave framework.
+        session_cookie (Cookie): The JSESSIONID cookie to continue with in the browser, set with its own path and flags.
+        url (str): The page to open. i.e. '/parabank/overview.htm'
+    """
+
+    base_url = utils.get_value_from_ini(context, utils.ConfigVars.server.value)
+    cookie = {'name': session_cookie.name, 'value': session_cookie.value, 'path': session_cookie.path or '/',
+              'secure': bool(session_cookie.secure), 'httpOnly': session_cookie.has_nonstandard_attr('HttpOnly')}
+
+    try:
+        # DevTools sets the cookie without loading a page of the server first.
+        context.browser.execute_cdp_cmd('Network.setCookie', {**cookie, 'url': base_url})
+    except (AttributeError, exceptions.WebDriverException):
+        # WebDriver only accepts cookies for the domain of the page being shown, the page to open would be loaded
+        # without the session if it was used for that.
+        if urlsplit(context.browser.current_url).netloc != urlsplit(base_url).netloc:
+            context.browser.get(base_url + NEUTRAL_PATH)
+
+        context.browser.add_cookie(cookie)
+
+    logger.debug(f'Handed the session "{session_cookie.value}" over to the browser.')
+
+    utils.open_page(context, url)
+
+
+def register_in_browser(context, url):
+    """This function registers a new customer through the API and opens the page in the browser as that customer.
+
+    Args:
+        context (Context): The default object is available throughout Behave framework.
+        url (str): The page to open. i.e. '/parabank/overview.htm'
+    """
+
+    payload = data_factory.get_factory(context).new_payload()
+    session_cookie = account_pool.register_session(context.config, payload)
+
+    context.registration_payload = payload
+    context.session_id = session_cookie.value
+
+    hand_off_session(context, session_cookie, url)
+
+
+def login_in_browser(context, url):
+    """This function logs the registered customer of the scenario in through the API and opens the page in the browser.
+
+    Args:
+        context (Context): The default object is available throughout Behave framework.
+        url (str): The page to open. i.e. '/parabank/overview.htm'
+    """
+
+    utils.has_context_attr(context, 'registration_payload')
+
+    session_cookie = login_session(context.config, context.registration_payload['customer.username'],
+                                   context.registration_payload['customer.password'])
+    context.session_id = session_cookie.value
+
+    hand_off_session(context, session_cookie, url)
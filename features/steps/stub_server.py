@@ -0,0 +1,352 @@
+import argparse
+import logging
+import secrets
+import threading
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl
+
+from steps import constants
+
+logger = logging.getLogger('myLogger')
+
+SESSION_COOKIE = 'JSESSIONID'
+
+# Registration form fields as (label, input name), in the order the Parabank registration page shows them.
+REGISTRATION_FIELDS = (
+    ('First Name:', 'customer.firstName'),
+    ('Last Name:', 'customer.lastName'),
+    ('Address:', 'customer.address.street'),
+    ('City:', 'customer.address.city'),
+    ('State:', 'customer.address.state'),
+    ('Zip Code:', 'customer.address.zipCode'),
+    ('Phone #:', 'customer.phoneNumber'),
+    ('SSN:', 'customer.ssn'),
+    ('Username:', 'customer.username'),
+    ('Password:', 'customer.password'),
+    ('Confirm:', 'repeatedPassword'),
+)
+
+OPTIONAL_FIELDS = ('customer.phoneNumber',)
+
+PAGE_TEMPLATE = '<html><head><title>ParaBank | {0}</title></head><body><div id="leftPanel">{1}</div>' \
+                '<div id="rightPanel">{2}</div></body></html>'
+
+LOGIN_PANEL = '<h2>Customer Login</h2><form method="post" action="login.htm">' \
+              '<input type="text" name="username"/><input type="password" name="password"/>' \
+              '<input type="submit" value="Log In"/></form><p><a href="register.htm">Register</a></p>'
+
+ACCOUNT_PANEL = '<p>Welcome {0}</p><ul><li><a href="overview.htm">Accounts Overview</a></li>' \
+                '<li><a href="logout.htm">Log Out</a></li></ul>'
+
+
+def render_page(title, content, _customer=None):
+
+    if _customer:
+        left_panel = ACCOUNT_PANEL.format(f'{_customer["customer.firstName"]} {_customer["customer.lastName"]}')
+    else:
+        left_panel = LOGIN_PANEL
+
+    return PAGE_TEMPLATE.format(title, left_panel, content).encode('utf-8')
+
+
+def render_registration_form(_errors=None):
+    rows = []
+
+    for label, name in REGISTRATION_FIELDS:
+        error = (_errors or {}).get(name, '')
+        rows.append(f'<tr><td>{label}</td><td><input name="{name}" type="text"/></td>'
+                    f'<td><span class="error">{error}</span></td></tr>')
+
+    return '<h1 class="title">Signing up is easy!</h1><p>If you have an account with us you can sign-up for free ' \
+           'instant online access.</p><form method="post" action="register.htm"><table>' + ''.join(rows) + \
+           '</table><input type="submit" value="Register"/></form>'
+
+
+HOMEPAGE_BODY = render_page('Welcome | Online Banking', '<h2>ATM Services</h2>')
+REGISTRATION_BODY = render_page('Register for Free Online Account Access', render_registration_form())
+LOGIN_ERROR_BODY = render_page('Error', '<h1 class="title">Error!</h1>'
+                                        '<p class="error">The username and password could not be verified.</p>')
+SERVER_ERROR_BODY = render_page('Error', '<h1 class="title">Error!</h1>'
+                                         '<p class="error">An internal error has occurred and has been logged.</p>')
+NOT_FOUND_BODY = render_page('Not Found', '<h1 class="title">Not Found</h1>')
+
+
+class ParabankState:
+    """This class keeps the sessions and the registered customers of the stand-in server."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.sessions = {}
+        self.customers = {}
+
+        username = constants.AccountCredentials.customer_username.value
+        password = constants.AccountCredentials.customer_password.value
+
+        customer = dict(constants.ApiConstant.register_customer_payload.value)
+        customer.update({'customer.username': username, 'customer.password': password, 'repeatedPassword': password})
+
+        self.customers[username] = customer
+
+    def new_session(self):
+        session_id = secrets.token_hex(16).upper()
+
+        with self.lock:
+            self.sessions[session_id] = {'username': None}
+
+        return session_id
+
+
+class ParabankRequestHandler(BaseHTTPRequestHandler):
+    """This class answers the Parabank endpoints of constants.ApiEndpoint the way the feature files expect."""
+
+    protocol_version = 'HTTP/1.1'
+    server_version = 'ParabankStub'
+
+    # Buffering the response and sending it in one segment avoids the delayed ACK stalls on keep-alive connections.
+    wbufsize = 64 * 1024
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        # Logging every request would dominate the cost of a request.
+        pass
+
+    @property
+    def state(self):
+        return self.server.state
+
+    def do_GET(self):
+        self.handle_request('GET')
+
+    def do_POST(self):
+        self.handle_request('POST')
+
+    def do_HEAD(self):
+        self.new_session_id = None
+        self.send_page(200, b'')
+
+    def handle_request(self, method):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length).decode('utf-8') if length else ''
+
+        path, _, _ = self.path.partition('?')
+        path, _, path_params = path.partition(';')
+
+        session_id = self.get_session_id(path_params)
+        self.session = self.state.sessions.get(session_id)
+        self.new_session_id = None
+
+        route = self.routes.get((method, path))
+
+        if route is None:
+            self.send_page(404, NOT_FOUND_BODY)
+        else:
+            route(self, body)
+
+    def get_session_id(self, path_params):
+
+        if path_params.startswith('jsessionid='):
+            return path_params[len('jsessionid='):]
+
+        cookie = SimpleCookie(self.headers.get('Cookie') or '')
+
+        return cookie[SESSION_COOKIE].value if SESSION_COOKIE in cookie else None
+
+    def ensure_session(self):
+
+        if self.session is None:
+            self.new_session_id = self.state.new_session()
+            self.session = self.state.sessions[self.new_session_id]
+
+    def get_customer(self):
+
+        if self.session is None or self.session['username'] is None:
+            return None
+
+        return self.state.customers.get(self.session['username'])
+
+    def send_page(self, status_code, body, _location=None):
+        self.send_response(status_code)
+
+        if self.new_session_id:
+            self.send_header('Set-Cookie', f'{SESSION_COOKIE}={self.new_session_id}; Path=/parabank; HttpOnly')
+
+        if _location:
+            self.send_header('Location', _location)
+
+        self.send_header('Content-Type', 'text/html;charset=UTF-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+    def redirect(self, page):
+        self.send_page(302, b'', _location=f'/parabank/{page}')
+
+    def homepage(self, body):
+        self.ensure_session()
+        customer = self.get_customer()
+
+        self.send_page(200, render_page('Welcome | Online Banking', '<h2>ATM Services</h2>', customer)
+                       if customer else HOMEPAGE_BODY)
+
+    def registration_page(self, body):
+        self.ensure_session()
+        self.send_page(200, REGISTRATION_BODY)
+
+    def register(self, body):
+
+        # A registration without an existing session is rejected like the live server does.
+        if self.session is None:
+            self.send_page(500, SERVER_ERROR_BODY)
+            return
+
+        customer = parse_form(body)
+        errors = {}
+
+        for _, name in REGISTRATION_FIELDS:
+
+            if name not in OPTIONAL_FIELDS and not customer.get(name):
+                errors[name] = 'This field is required.'
+
+        if customer.get('customer.password') != customer.get('repeatedPassword'):
+            errors['repeatedPassword'] = 'Passwords did not match.'
+
+        with self.state.lock:
+
+            if customer.get('customer.username') in self.state.customers:
+                errors['customer.username'] = 'This username already exists.'
+
+            if not errors:
+                self.state.customers[customer['customer.username']] = customer
+                self.session['username'] = customer['customer.username']
+
+        if errors:
+            self.send_page(200, render_page('Register for Free Online Account Access',
+                                            render_registration_form(errors)))
+        else:
+            self.send_page(200, render_page('Customer Created', f'<h1 class="title">Welcome '
+                                                                f'{customer["customer.username"]}</h1><p>Your account '
+                                                                f'was created successfully. You are now logged in.</p>',
+                                            customer))
+
+    def login(self, body):
+        self.ensure_session()
+
+        credentials = parse_form(body)
+        customer = self.state.customers.get(credentials.get('username'))
+
+        if customer and customer['customer.password'] == credentials.get('password'):
+            self.session['username'] = customer['customer.username']
+            self.redirect('overview.htm')
+        else:
+            self.send_page(200, LOGIN_ERROR_BODY)
+
+    def login_page(self, body):
+        self.ensure_session()
+        self.redirect('overview.htm' if self.get_customer() else 'index.htm')
+
+    def overview(self, body):
+        customer = self.get_customer()
+
+        if customer is None:
+            self.ensure_session()
+            self.redirect('index.htm')
+        else:
+            self.send_page(200, render_page('Accounts Overview', '<h1 class="title">Accounts Overview</h1>',
+                                            customer))
+
+    def logout(self, body):
+
+        if self.session is not None:
+            self.session['username'] = None
+
+        self.redirect('index.htm')
+
+    routes = {
+        ('GET', '/parabank/index.htm'): homepage,
+        ('GET', '/parabank/register.htm'): registration_page,
+        ('POST', '/parabank/register.htm'): register,
+        ('GET', '/parabank/login.htm'): login_page,
+        ('POST', '/parabank/login.htm'): login,
+        ('GET', '/parabank/overview.htm'): overview,
+        ('GET', '/parabank/logout.htm'): logout,
+    }
+
+
+def parse_form(body):
+    """This function parses the body of a form submission like Parabank does, any other encoding has no fields.
+
+    Args:
+        body (str): The url-encoded body of the request.
+
+    Returns:
+        form (dict): The submitted fields.
+    """
+
+    return dict(parse_qsl(body, keep_blank_values=True))
+
+
+class ParabankStubServer(ThreadingHTTPServer):
+    """This class is an in-process stand-in for the Parabank server running on a background thread."""
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, host='127.0.0.1', port=0):
+        super().__init__((host, port), ParabankRequestHandler)
+
+        self.state = ParabankState()
+        self.thread = threading.Thread(target=self.serve_forever, name='parabank-stub', daemon=True)
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self):
+        self.thread.start()
+        logger.debug(f'--- Started the Parabank stand-in server on "{self.base_url}". ---')
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        logger.debug('< Stopped the Parabank stand-in server.')
+
+
+def start_stub_server(context):
+    """This function starts the stand-in server on an ephemeral port and points the "server" of behave.ini to it.
+
+    Args:
+        context (Context): The default object is available throughout Behave framework.
+
+    Returns:
+        stub_server (ParabankStubServer): The running stand-in server.
+    """
+
+    stub_server = ParabankStubServer()
+    stub_server.start()
+
+    context.config.userdata['server'] = stub_server.base_url
+
+    return stub_server
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Runs the Parabank stand-in server, i.e. as a benchmark target.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    args = parser.parse_args()
+
+    stub_server = ParabankStubServer(args.host, args.port)
+    print(f'Parabank stand-in server is listening on {stub_server.base_url}')
+
+    try:
+        stub_server.serve_forever()
+    except KeyboardInterrupt:
+        stub_server.server_close()
+
+
+if __name__ == '__main__':
+    main()
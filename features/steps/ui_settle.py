@@ -0,0 +1,161 @@
+import logging
+import time
+
+import selenium.common.exceptions as exceptions
+
+logger = logging.getLogger('myLogger')
+
+# Tracks pending XHR and fetch requests, DOM mutations and navigations of the document it runs in.
+# A document that is being navigated away from is not settled, the next document is waited for instead. A document
+# shown again from the back-forward cache is no longer navigating.
+INSTRUMENT_SCRIPT = '''
+if (!window.__uiSettle) {
+    var state = window.__uiSettle = {pending: 0, lastChange: Date.now(), navigatingAt: 0};
+    var settled = function () { state.pending = Math.max(0, state.pending - 1); state.lastChange = Date.now(); };
+    var navigating = function () { state.navigatingAt = Date.now(); };
+
+    window.addEventListener('beforeunload', navigating);
+    window.addEventListener('pagehide', navigating);
+    window.addEventListener('pageshow', function () { state.navigatingAt = 0; });
+
+    var send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        state.pending++;
+        this.addEventListener('loadend', settled);
+        return send.apply(this, arguments);
+    };
+
+    if (window.fetch) {
+        var fetch = window.fetch;
+        window.fetch = function () {
+            state.pending++;
+            return fetch.apply(this, arguments).finally(settled);
+        };
+    }
+
+    new MutationObserver(function () { state.lastChange = Date.now(); })
+        .observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+}
+'''
+
+# Instruments the page if it is not yet and reports once it is quiescent, or false when the time is up.
+# Arguments: the quiet period, the time to wait and the navigation grace in milliseconds, the callback comes last.
+SETTLE_SCRIPT = '''
+var quietPeriod = arguments[0];
+var maxWait = arguments[1];
+var navigationGrace = arguments[2];
+var done = arguments[arguments.length - 1];
+''' + INSTRUMENT_SCRIPT + '''
+var startedAt = Date.now();
+
+(function poll() {
+    var state = window.__uiSettle;
+    var now = Date.now();
+    var navigating = state.navigatingAt !== 0 && now - state.navigatingAt < navigationGrace;
+    var quiet = state.pending === 0 && !navigating && now - state.lastChange >= quietPeriod;
+
+    if (document.readyState === 'complete' && quiet) {
+        done(true);
+    } else if (now - startedAt >= maxWait) {
+        done(false);
+    } else {
+        setTimeout(poll, 50);
+    }
+})();
+'''
+
+# The browser sessions that instrument every new document as soon as it is created.
+_instrumented_sessions = set()
+
+# The script timeout of a session that nobody has changed, as per the WebDriver specification.
+DEFAULT_SCRIPT_TIMEOUT = 30
+
+# The time in seconds after which a document that started to unload but is still shown has survived the navigation,
+# i.e. a download link, a cancelled navigation or a 204 response.
+NAVIGATION_GRACE = 1.0
+
+
+def instrument_new_documents(driver):
+    """This function makes the browser instrument every document before its own scripts run.
+
+    Otherwise a page is only instrumented by the first wait on it, so a navigation started by the action before that
+    wait would go unnoticed.
+
+    Args:
+        driver (WebDriver): The browser.
+    """
+
+    if driver.session_id in _instrumented_sessions:
+        return
+
+    _instrumented_sessions.add(driver.session_id)
+
+    try:
+        driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': INSTRUMENT_SCRIPT})
+    except (AttributeError, exceptions.WebDriverException) as error:
+        logger.debug(f'Unable to instrument new documents, pages are instrumented by the first wait: {error}')
+
+
+def get_script_timeout(driver):
+
+    try:
+        return driver.timeouts.script
+    except (AttributeError, exceptions.WebDriverException):
+        return DEFAULT_SCRIPT_TIMEOUT
+
+
+def wait_until_settled(driver, max_wait, _quiet_period=0.3):
+    """This function waits until the page has no pending navigation, XHR or fetch request and no DOM mutation.
+
+    Args:
+        driver (WebDriver): The browser showing the page.
+        max_wait (float): The time in seconds to wait at most, the fixed sleep this wait replaces.
+        _quiet_period (float): The time in seconds the page has to stay unchanged to be considered settled.
+
+    Returns:
+        settled (bool): Whether the page settled before max_wait, False means the whole time was waited.
+    """
+
+    instrument_new_documents(driver)
+
+    started_at = time.monotonic()
+    deadline = started_at + max_wait
+    script_timeout = get_script_timeout(driver)
+
+    try:
+        while True:
+            remaining = deadline - time.monotonic()
+
+            if remaining <= 0:
+                logger.debug(f'The page did not settle within {max_wait} seconds.')
+                return False
+
+            try:
+                driver.set_script_timeout(remaining + 1)
+                settled = driver.execute_async_script(SETTLE_SCRIPT, int(_quiet_period * 1000), int(remaining * 1000),
+                                                      int(NAVIGATION_GRACE * 1000))
+            except exceptions.WebDriverException:
+                # The script is lost when the page navigates away, the next document is waited for on the next try.
+                time.sleep(0.05)
+                continue
+
+            if settled:
+                logger.debug(f'The page settled after {time.monotonic() - started_at:.2f} seconds.')
+
+            return bool(settled)
+    finally:
+        # The script timeout applies to the whole session, the other scripts of the steps keep theirs.
+        try:
+            driver.set_script_timeout(script_timeout)
+        except exceptions.WebDriverException:
+            pass
+
+
+def forget(driver):
+    """This function forgets a browser that has quit.
+
+    Args:
+        driver (WebDriver): The browser that has quit.
+    """
+
+    _instrumented_sessions.discard(driver.session_id)
@@ -1,22 +1,18 @@
-﻿import copy
-import json
-import logging
+﻿import logging
 import pathlib
 import random
 import string
 from enum import Enum
 from time import sleep
 
-import requests
-import requests.auth
 import selenium.common.exceptions as exceptions
 import selenium.webdriver.chrome.options as chrome_options
 from selenium import webdriver
-from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 
-from steps import constants
+from steps import (browser_profiles, cassette, constants, dom_snapshot, hashing, http_cache, http_metrics, http_session,
+                   locators, payload_templates, resilience, resource_blocking, ui_settle, virtual_display)
 
 logger = logging.getLogger('myLogger')
 
@@ -29,24 +25,44 @@ class ConfigVars(Enum):
 
     browser = 'browser'
     server = 'server'
+    http_mode = 'http_mode'
 
     driver_wait_time = 'DRIVER_WAIT_TIME'
     stable_elems_sleep = 'STABLE_ELEMS_SLEEP'
     unstable_elems_sleep = 'UNSTABLE_ELEMS_SLEEP'
+    ui_settle = 'UI_SETTLE'
+    dom_snapshot = 'DOM_SNAPSHOT'
+    ui_settle_quiet_period = 'UI_SETTLE_QUIET_PERIOD'
 
+    http_pool_prewarm = 'HTTP_POOL_PREWARM'
+    async_concurrency = 'ASYNC_CONCURRENCY'
+    cassette_dir = 'CASSETTE_DIR'
+    http_metrics = 'HTTP_METRICS'
+    http_metrics_dir = 'HTTP_METRICS_DIR'
 
-def get_value_from_ini(context, key):
+    session_cache = 'SESSION_CACHE'
+    session_cache_size = 'SESSION_CACHE_SIZE'
+    session_cache_ttl = 'SESSION_CACHE_TTL'
+
+    account_pool = 'ACCOUNT_POOL'
+    account_pool_size = 'ACCOUNT_POOL_SIZE'
+    account_pool_min_size = 'ACCOUNT_POOL_MIN_SIZE'
+    account_pool_manifest = 'ACCOUNT_POOL_MANIFEST'
+
+
+def get_value_from_ini(context, key, _default=None):
     """This function returns the configuration value from behave.ini.
 
     Args:
         context (Context): The default object is available throughout Behave framework.
         key (Any): Key in the key-value pair from the behave.ini.
+        _default (Any): The value to return if the key is missing from the behave.ini.
 
     Returns:
         Value (Enum): Value in the key-value pair from the behave.ini
     """
 
-    return context.config.userdata.get(key)
+    return context.config.userdata.get(key, _default)
 
 
 def to_camel_case(regular_str):
@@ -79,7 +95,7 @@ def get_random_string(length):
     """
 
     letters = string.ascii_lowercase
-    result_str = ''.join(random.choice(letters) for i in range(length))
+    result_str = ''.join(random.choices(letters, k=length))
     logger.debug(f'Random string of length {length} is "{result_str}"')
     return result_str
 
@@ -95,7 +111,7 @@ def get_random_number(length):
     """
 
     digits = string.digits
-    result_str = ''.join(random.choice(digits) for i in range(length))
+    result_str = ''.join(random.choices(digits, k=length))
     logger.debug(f'Random number of length {length} is "{result_str}"')
     return result_str
 
@@ -220,42 +236,40 @@ def get_json_response(context):
 
 
 def generate_hash(username, _secret_key='any_secret_key.com'):
-    """This function generates the hash value against the provided username.
+    """This function generates the HMAC-SHA256 hash value against the provided username.
 
     Args:
         username (str): The username of the account holder.
         _secret_key (str): Any Secret key to use while creating hash.
 
-    Raises:
-        AssertionError: An exception arises if any of the following situations occur:
-                        1) if the "Status Code" of the request being made is not 200.
-
     Returns:
         hash_string (str): The hash being generated.
     """
 
-    website_url = 'https://www.devglan.com/online-tools/hmac-sha256-online'
+    return hashing.generate_hash(payload_templates.hash_generating.overlay(inputString=username, secretKey=_secret_key))
 
-    payload = copy.deepcopy(constants.ApiConstant.hash_generating_payload.value)
 
-    payload["inputString"] = username
-    payload["secretKey"] = _secret_key
+def generate_hashes(usernames, _secret_key='any_secret_key.com'):
+    """This function generates the HMAC-SHA256 hash values against many usernames at once. i.e. for bulk account setup
 
-    logger.debug(f'Payload for generating hash: {payload}')
+    Args:
+        usernames (Iterable): The usernames of the account holders.
+        _secret_key (str): Any Secret key to use while creating hash.
 
-    response = requests.post(website_url, json=payload)
+    Returns:
+        hashes (dict): The hash being generated for every username.
+    """
 
-    if response.status_code == 200:
-        return response.json()["outputString"]
-    else:
-        raise AssertionError(f'Unable to generate Hash for user: {username} with status code: {response.status_code}')
+    payload = payload_templates.hash_generating.base
+
+    return hashing.generate_hashes(usernames, _secret_key, payload["algo"], payload["outputFormat"])
 
 
 # Backend Testing utils
 
 
 def validate_endpoint(context, _request_type):
-    """This function validates that the context has required endpoint attribute to make the request.
+    """This function validates that the context has the spec of the request and points it at the server.
 
     Args:
         context (Context): The default object is available throughout Behave framework.
@@ -263,113 +277,184 @@ def validate_endpoint(context, _request_type):
 
     Raises:
         AssertionError: An exception arises if any of the following situations occur:
-                        1) if 'endpoint' attribute is not found in the context.
+                        1) if 'request_spec' attribute is not found in the context.
                         2) Something goes fishy on the server side.
     """
 
     server = get_value_from_ini(context, ConfigVars.server.value)
 
-    if not hasattr(context, 'endpoint'):
-        raise AssertionError(f'Context should have a valid "endpoint" attribute to make "{_request_type}" request.')
+    if not hasattr(context, 'request_spec'):
+        raise AssertionError(f'Context should have a valid "request_spec" attribute to make "{_request_type}" '
+                             f'request.')
+
+    spec = context.request_spec
+    changes = {}
+
+    if server not in spec.endpoint:
+        changes['endpoint'] = server + spec.endpoint
+
+    if spec.method != _request_type.upper():
+        changes['method'] = _request_type
 
-    if server not in context.endpoint:
-        context.endpoint = server + context.endpoint
+    if changes:
+        context.request_spec = spec.replace(**changes)
 
 
-def generate_request_logs(context, _request_type):
-    """This function generates specific logs for testing purposes based on the attributes being passed in the context.
+def generate_request_logs(spec):
+    """This function generates specific logs for testing purposes based on the request being made.
+
+    Args:
+        spec (RequestSpec): The request being made.
+    """
+
+    if spec.payload:
+        logger.debug(f'Payload ({spec.body_type.value}): {spec.payload}')
+
+    if spec.files:
+        logger.debug(f'Files: {spec.files}')
+
+    if not spec.allow_redirects:
+        logger.debug(f'Allow redirects is set to "{spec.allow_redirects}".')
+
+    if spec.headers:
+        logger.debug(f'Headers: {spec.headers}')
+
+    logger.debug(f'Endpoint: {spec.endpoint}')
+
+
+def prepare_request(context, _request_type='GET'):
+    """This function validates the spec of the request built by the steps and logs it.
 
     Args:
         context (Context): The default object is available throughout Behave framework.
         _request_type (str): CRUD operation being used while making the request.
     """
 
-    if not hasattr(context, 'payload'):
-        context.payload = {}
-    elif context.payload:
-        logger.debug(f'Payload: {context.payload}')
+    validate_endpoint(context, _request_type)
+    generate_request_logs(context.request_spec)
 
-    if not hasattr(context, 'files'):
-        context.files = []
-    elif context.files:
-        logger.debug(f'Files: {context.files}')
 
-    if hasattr(context, 'allow_redirects'):
-        logger.debug(f'Allow redirects is set to "{context.allow_redirects}".')
-    else:
-        context.allow_redirects = True
+def send_request_spec(spec, _deadline=None, _request_kwargs=None):
+    """This function sends the request with the pooled keep-alive session of the current worker.
 
-    if hasattr(context, 'headers') and context.headers:
-        logger.debug(f'Headers: {context.headers}')
+    The request goes through the circuit breaker of the run and idempotent requests are retried, see resilience.send.
 
-    logger.debug(f'Endpoint: {context.endpoint}')
+    Args:
+        spec (RequestSpec): The request to send.
+        _deadline (float): The time.monotonic value the scenario has to finish by, None if it has no deadline.
+        _request_kwargs (dict): The spec already encoded with RequestSpec.encode, it is encoded here if None.
+
+    Returns:
+        response (Response): The response of the request.
+    """
+
+    session = http_session.get_session()
+    request_kwargs = _request_kwargs if _request_kwargs is not None else spec.encode()
+
+    def send_attempt(timeout):
+        # Every attempt is timed on its own, so retries do not add up in the timings of the response.
+        http_metrics.start_attempt()
+
+        return session.request(spec.method, spec.endpoint, timeout=timeout, **request_kwargs)
+
+    return resilience.send(send_attempt, spec.method, _deadline)
 
 
-def dump_payload(context):
-    """This function properly dumps the payload if it is not in url-encoded format.
+def get_endpoint_path(context):
+    """This function returns the endpoint of the request without the server.
 
     Args:
         context (Context): The default object is available throughout Behave framework.
+
+    Returns:
+        endpoint_path (str): The endpoint relative to the server. i.e. '/parabank/index.htm'
     """
 
-    if str(context.payload).startswith('{') and str(context.payload).endswith('}'):
-        context.payload = json.dumps(context.payload)
-    else:
-        # No need to dump the payload if it is in url-encoded format. i.e. 'username=abc&password=xyz'
-        pass
+    server = get_value_from_ini(context, ConfigVars.server.value)
+    endpoint = context.request_spec.endpoint
 
+    return endpoint[len(server):] if endpoint.startswith(server) else endpoint
 
-def prepare_request(context, _request_type='GET'):
-    """This function validates that the required attributes are present in the context before making a request.
+
+def get_request_fingerprint(context, _request_type, request_kwargs):
+    """This function creates the cassette fingerprint of the request that is about to be sent.
 
     Args:
         context (Context): The default object is available throughout Behave framework.
         _request_type (str): CRUD operation being used while making the request.
+        request_kwargs (dict): The spec of the request encoded with RequestSpec.encode.
+
+    Returns:
+        fingerprint (str): The fingerprint of the request independent of the server it is sent to.
     """
 
-    validate_endpoint(context, _request_type)
-    generate_request_logs(context, _request_type)
-    dump_payload(context)
+    spec = context.request_spec
 
+    return cassette.fingerprint_request(_request_type, get_endpoint_path(context), spec.headers,
+                                        request_kwargs['data'], spec.files)
 
-def send_request_with_headers(context, _request_type):
 
-    if hasattr(context, 'files') and context.files:
-        context.response = requests.request(_request_type, context.endpoint, headers=context.headers,
-                                            json=context.payload, files=context.files,
-                                            allow_redirects=context.allow_redirects)
-    else:
-        context.response = requests.request(_request_type, context.endpoint, headers=context.headers,
-                                            data=context.payload, allow_redirects=context.allow_redirects)
+def get_metrics_endpoint(context, _request_type):
+    """This function returns the name under which the timings of the request are aggregated.
+
+    Args:
+        context (Context): The default object is available throughout Behave framework.
+        _request_type (str): CRUD operation being used while making the request.
 
+    Returns:
+        metrics_endpoint (str): The request type and the endpoint without session id. i.e. 'GET /parabank/login.htm'
+    """
 
-def send_request_without_headers(context, _request_type):
+    endpoint_path = get_endpoint_path(context).partition('?')[0].partition(';')[0]
 
-    if hasattr(context, 'files') and context.files:
-        context.response = requests.request(_request_type, context.endpoint,
-                                            json=context.payload, files=context.files,
-                                            allow_redirects=context.allow_redirects)
-    else:
-        context.response = requests.request(_request_type, context.endpoint, data=context.payload,
-                                            allow_redirects=context.allow_redirects)
+    return f'{_request_type.upper()} {endpoint_path}'
 
 
 def send_request(context, _request_type='GET'):
-    """This function uses the local server base urls to make the request without the need to include certificates.
+    """This function uses the pooled keep-alive session of the current worker to make the request.
+
+    Depending on the "http_mode" the response is also recorded in, or replayed from, the cassette.
+    GET requests whose spec is cacheable go through the HTTP cache if it is enabled, only the requests that reach the
+    server are timed so that cache hits do not skew the latency percentiles.
 
     Args:
         context (Context): The default object is available throughout Behave framework.
         _request_type (str): CRUD operation being used while making the request.
     """
 
-    if hasattr(context, 'headers') and context.headers:
-        send_request_with_headers(context, _request_type)
+    http_mode = cassette.get_mode()
+    spec = context.request_spec
+
+    # The body is encoded once for both the fingerprint and the request.
+    request_kwargs = spec.encode()
+    context.request_timings = None
+
+    if http_mode != cassette.PASSTHROUGH_MODE:
+        fingerprint = get_request_fingerprint(context, _request_type, request_kwargs)
+
+    if http_mode == cassette.REPLAY_MODE:
+        context.response = cassette.replay(fingerprint, _request_type, spec.endpoint)
     else:
-        send_request_without_headers(context, _request_type)
+        deadline = getattr(context, 'scenario_deadline', None)
+        cache = http_cache.get_cache(spec)
 
-    # Resetting the context attributes to default values after making the request.
-    context.payload = {}
-    context.files = []
+        def send_timed_request(sent_spec, sent_kwargs):
+            started_at = http_metrics.start_request()
+            response = send_request_spec(sent_spec, deadline, sent_kwargs)
+            context.request_timings = http_metrics.finish_request(get_metrics_endpoint(context, _request_type),
+                                                                  response, started_at)
+
+            return response
+
+        if cache is not None:
+            # Revalidations only add the validators to the headers of the encoded request.
+            context.response = cache.send(spec, lambda sent_spec: send_timed_request(
+                sent_spec, {**request_kwargs, 'headers': sent_spec.headers or None}))
+        else:
+            context.response = send_timed_request(spec, request_kwargs)
+
+    if http_mode == cassette.RECORD_MODE:
+        cassette.record(fingerprint, context.response)
 
 
 def validate_request(context, expected_code):
@@ -393,6 +478,14 @@ def validate_request(context, expected_code):
     else:
         logger.debug(f'Unknown Response: {context.response.text}')
 
+    if getattr(context, 'request_timings', None):
+        timings = context.request_timings
+        logger.debug(f'Timings | Connect: {timings["connect"] * 1000:.1f} ms | TLS: {timings["tls"] * 1000:.1f} ms | '
+                     f'TTFB: {timings["ttfb"] * 1000:.1f} ms | Download: {timings["download"] * 1000:.1f} ms | '
+                     f'Redirects: {timings["redirects"]} in {timings["redirect"] * 1000:.1f} ms | '
+                     f'Retries: {timings["retries"]} in {timings["retry_wait"] * 1000:.1f} ms | '
+                     f'Total: {timings["total"] * 1000:.1f} ms | Body: {timings["body_size"]} bytes')
+
     if expected_code:
         actual_code = context.response.status_code
         assert_text(str(expected_code), actual_code, _text_to_assert="Status Code")
@@ -414,6 +507,45 @@ def make_request(context, _request_type='GET', _status_code=0):
     validate_request(context, _status_code)
 
 
+def warm_up_http_session(context):
+    """This function opens the pooled connection to the server before the first scenario if enabled in behave.ini.
+
+    Args:
+        context (Context): The default object is available throughout Behave framework.
+    """
+
+    http_session.configure_sessions(context)
+
+    cassette.configure(get_value_from_ini(context, ConfigVars.http_mode.value),
+                       get_value_from_ini(context, ConfigVars.cassette_dir.value, '../cassettes/'))
+
+    if cassette.get_mode() == cassette.REPLAY_MODE:
+        # Replayed runs never open a connection to the server.
+        return
+
+    if str(get_value_from_ini(context, ConfigVars.http_pool_prewarm.value, 'false')).lower() == 'true':
+        http_session.warm_up_session(get_value_from_ini(context, ConfigVars.server.value))
+
+
+def export_http_metrics(context):
+    """This function saves the latency percentiles per endpoint if enabled in behave.ini.
+
+    Args:
+        context (Context): The default object is available throughout Behave framework.
+    """
+
+    if str(get_value_from_ini(context, ConfigVars.http_metrics.value, 'false')).lower() != 'true':
+        return
+
+    metrics_dir = get_value_from_ini(context, ConfigVars.http_metrics_dir.value, '../reports/')
+    load_user = get_value_from_ini(context, 'load_user')
+
+    # Every virtual user of a load test writes its own files.
+    file_name = 'http_metrics' if load_user is None else f'http_metrics_{load_user}'
+
+    http_metrics.request_metrics.export(metrics_dir, file_name)
+
+
 # Frontend Testing utils
 
 def get_browser(context):
@@ -432,17 +564,17 @@ def get_browser(context):
     desired_browser = get_value_from_ini(context, ConfigVars.browser.value)
 
     if desired_browser == 'chrome':
-        custom_options = chrome_options.Options()
+        # Each browser runs on its own clone of a prepared template profile if CHROME_PROFILE_CACHE is enabled.
+        profile_dir = browser_profiles.get_profile(context, lambda template_dir: launch_chrome(context, template_dir),
+                                                   get_value_from_ini(context, ConfigVars.server.value))
 
-        prefs = {'download.default_directory': '/downloads'}
-        custom_options.add_experimental_option("prefs", prefs)
+        try:
+            browser = launch_chrome(context, profile_dir)
+        except Exception:
+            browser_profiles.remove_profile(profile_dir)
+            raise
 
-        if context.test_headless:
-            custom_options.headless = True
-            custom_options.add_argument('--no-sandbox')
-            custom_options.add_argument('--disable-dev-shm-usage')
-
-        browser = webdriver.Chrome(chrome_options=custom_options)
+        browser_profiles.track(browser, profile_dir)
         browser.set_window_size(1920, 1080)
 
         browser_name = browser.capabilities["browserName"]
@@ -457,6 +589,46 @@ def get_browser(context):
         raise AssertionError(f'The settings for browser {desired_browser} are not configured.')
 
 
+def launch_chrome(context, _user_data_dir=None):
+    """This function launches Chrome with the options of the test run.
+
+    Args:
+        context (Context): The default object is available throughout Behave framework.
+        _user_data_dir (str): The profile Chrome runs with, a throwaway profile if None.
+
+    Returns:
+        browser (WebDriver): The Chrome browser instance.
+    """
+
+    custom_options = chrome_options.Options()
+
+    prefs = {'download.default_directory': '/downloads'}
+    custom_options.add_experimental_option("prefs", prefs)
+
+    if context.test_headless:
+
+        # The native headless mode of Chrome needs no virtual display.
+        if virtual_display.get_headless_mode(context) == 'native':
+            custom_options.add_argument('--headless=new')
+        else:
+            custom_options.headless = True
+
+        custom_options.add_argument('--no-sandbox')
+        custom_options.add_argument('--disable-dev-shm-usage')
+
+    if _user_data_dir is not None:
+        custom_options.add_argument(f'--user-data-dir={_user_data_dir}')
+
+        for argument in browser_profiles.CHROME_ARGUMENTS:
+            custom_options.add_argument(argument)
+
+    if resource_blocking.is_enabled():
+        # The performance log holds the DevTools network events the blocked requests are counted from.
+        custom_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+
+    return webdriver.Chrome(chrome_options=custom_options)
+
+
 def open_page(context, url, _elem_xpath='', _elem_index=0, _error_msg='', _driver_wait_time=-1):
     """This function waits until the specified element become clickable on the Web Page using Text.
 
@@ -479,6 +651,7 @@ def open_page(context, url, _elem_xpath='', _elem_index=0, _error_msg='', _drive
 
     logger.debug(f'Loading Page: "{full_url}"')
     context.browser.get(full_url)
+    dom_snapshot.invalidate(context.browser)
 
     if _elem_xpath:
 
@@ -515,7 +688,7 @@ def wait_for_elems(context, elems_xpath, _error_msg='', _driver_wait_time=-1):
 
     try:
         elems = WebDriverWait(context.browser, _driver_wait_time).until(
-                    EC.presence_of_all_elements_located((By.XPATH, elems_xpath)))
+                    EC.presence_of_all_elements_located(locators.compile_locator(elems_xpath)))
     except exceptions.TimeoutException:
         raise AssertionError(_error_msg)
 
@@ -586,12 +759,7 @@ def wait_for_elems_by_text(context, elems_text, _exact_text=False, _error_msg=''
     if _driver_wait_time <= 0:
         _driver_wait_time = int(get_value_from_ini(context, ConfigVars.driver_wait_time.value))
 
-    if _exact_text:
-        locate_elem_by_xpath = constants.FrontEndXpath.locate_elem_by_exact_text_xpath.value.replace(
-            '"', "'").format(elems_text)
-    else:
-        locate_elem_by_xpath = constants.FrontEndXpath.locate_elem_by_having_text_xpath.value.replace(
-            '"', "'").format(elems_text)
+    locate_elem_by_xpath = locators.format_text_xpath(elems_text, _exact_text)
 
     elems = wait_for_elems(context, locate_elem_by_xpath, _error_msg, _driver_wait_time)
 
@@ -600,6 +768,47 @@ def wait_for_elems_by_text(context, elems_text, _exact_text=False, _error_msg=''
     return elems
 
 
+DESCRIBE_ELEMS_SCRIPT = '''
+var elems = arguments[0];
+var elemText = arguments[1].toLowerCase().trim();
+var elemIndex = arguments[2];
+var exactTextIndex = -1;
+
+var matches = elems.map(function (elem, index) {
+    var displayed = !!(elem.offsetWidth || elem.offsetHeight || elem.getClientRects().length);
+    var text = displayed ? (elem.innerText || '').trim() : '';
+
+    if (text.toLowerCase() === elemText) {
+        exactTextIndex = index;
+    }
+
+    return {index: index, text: text, displayed: displayed};
+});
+
+// In case of multiple elements having same text, the element with the exact text is preferred.
+return {elemIndex: exactTextIndex !== -1 && elemIndex === 0 ? exactTextIndex : elemIndex, matches: matches};
+'''
+
+
+def describe_elems_by_text(context, elems, elem_text, _elem_index=0):
+    """This function fetches the text and visibility of all the elements at once and chooses the one to use.
+
+    Args:
+        context (Context): The default object is available throughout Behave framework.
+        elems (list): The WebDriverElements matching the text.
+        elem_text (str): The visible text of the elements that we are looking for.
+        _elem_index (int): In the case of multiple elements, one can specify one of the indexes from the list.
+
+    Returns:
+        elem_index (int): The index of the element with the exact text if _elem_index is 0, otherwise _elem_index.
+        matches (list): The index, visible text and visibility of every element.
+    """
+
+    description = context.browser.execute_script(DESCRIBE_ELEMS_SCRIPT, elems, elem_text, _elem_index)
+
+    return description['elemIndex'], description['matches']
+
+
 def wait_for_elem_by_text(context, elem_text, _elem_index=0, _exact_text=False, _error_msg='', _driver_wait_time=-1):
     """This function waits until the presence of the specified element is located on the Web Page using Text.
 
@@ -628,24 +837,9 @@ def wait_for_elem_by_text(context, elem_text, _elem_index=0, _exact_text=False,
 
         raise AssertionError(_error_msg)
 
-    exact_text_index = -1
-
-    for index in range(len(elems)):
-        elem = elems[index]
-
-        if elem_text.lower().strip() == elem.text.lower().strip():
-            exact_text_index = index
-
-    # In case of multiple elements having same text, AI based approach to choose element with exact text.
-    if exact_text_index != -1 and _elem_index == 0:
-        elem = elems[exact_text_index]
-    else:
-        elem = elems[_elem_index]
-
-    if elem.is_displayed():
-        text = elem.text.replace('\n', '<br>').replace('\r', '').strip()
-    else:
-        text = ''
+    elem_index, matches = describe_elems_by_text(context, elems, elem_text, _elem_index)
+    elem = elems[elem_index]
+    text = matches[elem_index]['text'].replace('\n', '<br>').replace('\r', '')
 
     logger.debug(f'Located Element with Text: "{text}".')
 
@@ -676,7 +870,7 @@ def locate_elems(context, elems_xpath, _error_msg='', _driver_wait_time=-1):
 
     try:
         elems = WebDriverWait(context.browser, _driver_wait_time).until(
-                    EC.visibility_of_all_elements_located((By.XPATH, elems_xpath)))
+                    EC.visibility_of_all_elements_located(locators.compile_locator(elems_xpath)))
     except exceptions.TimeoutException:
         raise AssertionError(_error_msg)
 
@@ -724,12 +918,17 @@ def locate_elem(context, elem_xpath, _elem_index=0, _error_msg='', _driver_wait_
     return elem
 
 
-def locate_elems_by_text(context, elems_text, _exact_text=False, _error_msg='', _driver_wait_time=-1):
-    """This function waits until the specified elements becomes visible on the Web Page using Text.
+def wait_for_visible_elems_by_text(context, elems_text, _elem_index=0, _exact_text=False, _error_msg='',
+                                   _driver_wait_time=-1):
+    """This function waits until the elements having the text are present and all of them are displayed.
+
+    Each poll finds the elements and reads their text and visibility with DESCRIBE_ELEMS_SCRIPT, i.e. two round trips
+    however many elements match instead of one is_displayed call per element.
 
     Args:
         context (Context): The default object is available throughout Behave framework.
         elems_text (str): The visible text of the elements that we are looking for.
+        _elem_index (int): In the case of multiple elements, one can specify one of the indexes from the list.
         _exact_text (bool): This flag helps to decide whether an element has the exact text or contains the text.
         _error_msg (str): The error message to raise if the web elements are missing.
         _driver_wait_time (int): WebDriver waits for a specified number of seconds at max while looking for the element.
@@ -738,7 +937,9 @@ def locate_elems_by_text(context, elems_text, _exact_text=False, _error_msg='',
         AssertionError: If no elements are visible using Text then raises this specific exception.
 
     Returns:
-        WebDriverElement (list): It returns a list of WebDriverElements after searching the Web Page.
+        elems (list): The WebDriverElements having the text.
+        elem_index (int): The index of the element to use, see describe_elems_by_text.
+        matches (list): The text and visibility of every element.
     """
 
     if not _error_msg:
@@ -747,18 +948,52 @@ def locate_elems_by_text(context, elems_text, _exact_text=False, _error_msg='',
     if _driver_wait_time <= 0:
         _driver_wait_time = int(get_value_from_ini(context, ConfigVars.driver_wait_time.value))
 
-    if _exact_text:
-        locate_elem_by_xpath = constants.FrontEndXpath.locate_elem_by_exact_text_xpath.value.replace(
-            '"', "'").format(elems_text)
-    else:
-        locate_elem_by_xpath = constants.FrontEndXpath.locate_elem_by_having_text_xpath.value.replace(
-            '"', "'").format(elems_text)
+    locator = locators.compile_locator(locators.format_text_xpath(elems_text, _exact_text))
+
+    def visible_elems(driver):
+        elems = driver.find_elements(*locator)
+
+        if not elems:
+            return False
+
+        description = driver.execute_script(DESCRIBE_ELEMS_SCRIPT, elems, elems_text, _elem_index)
+
+        if not all(match['displayed'] for match in description['matches']):
+            return False
 
-    elems = locate_elems(context, locate_elem_by_xpath, _error_msg, _driver_wait_time)
+        return elems, description['elemIndex'], description['matches']
+
+    try:
+        elems, elem_index, matches = WebDriverWait(
+            context.browser, _driver_wait_time,
+            ignored_exceptions=(exceptions.StaleElementReferenceException,)).until(visible_elems)
+    except exceptions.TimeoutException:
+        raise AssertionError(_error_msg)
 
     logger.debug(f'The number of Elements located: {len(elems)}')
 
-    return elems
+    return elems, elem_index, matches
+
+
+def locate_elems_by_text(context, elems_text, _exact_text=False, _error_msg='', _driver_wait_time=-1):
+    """This function waits until the specified elements becomes visible on the Web Page using Text.
+
+    Args:
+        context (Context): The default object is available throughout Behave framework.
+        elems_text (str): The visible text of the elements that we are looking for.
+        _exact_text (bool): This flag helps to decide whether an element has the exact text or contains the text.
+        _error_msg (str): The error message to raise if the web elements are missing.
+        _driver_wait_time (int): WebDriver waits for a specified number of seconds at max while looking for the element.
+
+    Raises:
+        AssertionError: If no elements are visible using Text then raises this specific exception.
+
+    Returns:
+        WebDriverElement (list): It returns a list of WebDriverElements after searching the Web Page.
+    """
+
+    return wait_for_visible_elems_by_text(context, elems_text, _exact_text=_exact_text, _error_msg=_error_msg,
+                                          _driver_wait_time=_driver_wait_time)[0]
 
 
 def locate_elem_by_text(context, elem_text, _elem_index=0, _exact_text=False, _error_msg='', _driver_wait_time=-1):
@@ -781,7 +1016,8 @@ def locate_elem_by_text(context, elem_text, _elem_index=0, _exact_text=False, _e
         elem (WebDriverElement): It returns the WebDriverElement from either the default index or the specified index.
     """
 
-    elems = locate_elems_by_text(context, elem_text, _exact_text, _error_msg, _driver_wait_time)
+    elems, elem_index, matches = wait_for_visible_elems_by_text(context, elem_text, _elem_index, _exact_text,
+                                                                _error_msg, _driver_wait_time)
 
     if _elem_index >= len(elems):
         err_msg = f'Requested Index: "{_elem_index}" | Actual Count: "{len(elems)}" | ' \
@@ -789,28 +1025,45 @@ def locate_elem_by_text(context, elem_text, _elem_index=0, _exact_text=False, _e
 
         raise AssertionError(err_msg)
 
-    exact_text_index = -1
+    elem = elems[elem_index]
+    text = matches[elem_index]['text'].replace('\n', '<br>').replace('\r', '')
 
-    for index in range(len(elems)):
-        elem = elems[index]
+    logger.debug(f'The element located using Text: "{text}"')
 
-        if elem_text.lower().strip() == elem.text.lower().strip():
-            exact_text_index = index
+    return elem
 
-    # In case of multiple elements having same text, AI based approach to choose element with exact text.
-    if exact_text_index != -1 and _elem_index == 0:
-        elem = elems[exact_text_index]
-    else:
-        elem = elems[_elem_index]
 
-    if elem.is_displayed():
-        text = elem.text.replace('\n', '<br>').replace('\r', '').strip()
-    else:
-        text = ''
+def assert_text_visible(context, elem_text, _exact_text=False, _error_msg='', _driver_wait_time=-1):
+    """This function asserts that the text is visible on the Web Page, from the snapshot of the page if possible.
 
-    logger.debug(f'The element located using Text: "{text}"')
+    The snapshot is taken once per page and answers all the assertions about it while the page does not change.
+    If the text is not in the snapshot, or one of the elements having it is hidden, the page may still be loading and
+    the text is waited for in the browser.
 
-    return elem
+    Args:
+        context (Context): The default object is available throughout Behave framework.
+        elem_text (str): The visible text of the elements that we are looking for.
+        _exact_text (bool): This flag helps to decide whether an element has the exact text or contains the text.
+        _error_msg (str): The error message to raise if the web elements are missing.
+        _driver_wait_time (int): WebDriver waits for a specified number of seconds at max while looking for the element.
+
+    Raises:
+        AssertionError: An exception arises if the text is not visible within _driver_wait_time.
+    """
+
+    if str(get_value_from_ini(context, ConfigVars.dom_snapshot.value, 'true')).lower() == 'true':
+        nodes = dom_snapshot.get_snapshot(context.browser).find_by_text(elem_text, _exact_text, _visible_only=False)
+
+        # Like the wait in the browser, the text is only visible once every element having it is rendered.
+        if nodes and not any(node.hidden for node in nodes):
+            logger.debug(f'The text "{elem_text}" is visible in {len(nodes)} elements of the page snapshot.')
+            return
+
+        # The next query takes a new snapshot of the page the browser has loaded by then.
+        dom_snapshot.invalidate(context.browser)
+
+    locate_elem_by_text(context, elem_text, _exact_text=_exact_text, _error_msg=_error_msg,
+                        _driver_wait_time=_driver_wait_time)
 
 
 def clickable_elem(context, elem_xpath, _error_msg='', _driver_wait_time=-1):
@@ -837,7 +1090,7 @@ def clickable_elem(context, elem_xpath, _error_msg='', _driver_wait_time=-1):
 
     try:
         elem = WebDriverWait(context.browser, _driver_wait_time).until(
-                    EC.element_to_be_clickable((By.XPATH, elem_xpath)))
+                    EC.element_to_be_clickable(locators.compile_locator(elem_xpath)))
     except exceptions.TimeoutException:
         raise AssertionError(_error_msg)
 
@@ -870,24 +1123,39 @@ def clickable_elem_by_text(context, elem_text, _elem_index=0, _exact_text=False,
     if _driver_wait_time <= 0:
         _driver_wait_time = int(get_value_from_ini(context, ConfigVars.driver_wait_time.value))
 
-    if _exact_text:
-        locate_elem_by_xpath = constants.FrontEndXpath.locate_elem_by_exact_text_xpath.value.replace(
-            '"', "'").format(elem_text)
-    else:
-        locate_elem_by_xpath = constants.FrontEndXpath.locate_elem_by_having_text_xpath.value.replace(
-            '"', "'").format(elem_text)
+    locate_elem_by_xpath = locators.format_text_xpath(elem_text, _exact_text)
 
     try:
         elem = WebDriverWait(context.browser, _driver_wait_time).until(
-                    EC.element_to_be_clickable((By.XPATH, locate_elem_by_xpath)))
+                    EC.element_to_be_clickable(locators.compile_locator(locate_elem_by_xpath)))
     except exceptions.TimeoutException:
         raise AssertionError(_error_msg)
 
     return elem
 
 
+def wait_for_ui_to_settle(context, _click_sleep, _fixed_sleep=False):
+    """This function waits until the page has settled after an action, for _click_sleep seconds at most.
+
+    Args:
+        context (Context): The default object is available throughout Behave framework.
+        _click_sleep (int): The time in seconds to wait at most for the UI to update.
+        _fixed_sleep (bool): Always wait for the whole _click_sleep instead of until the UI has settled.
+    """
+
+    # The action may have changed the page, so its snapshot is taken again.
+    dom_snapshot.invalidate(context.browser)
+
+    if _fixed_sleep or str(get_value_from_ini(context, ConfigVars.ui_settle.value, 'true')).lower() != 'true':
+        sleep(_click_sleep)
+        return
+
+    quiet_period = float(get_value_from_ini(context, ConfigVars.ui_settle_quiet_period.value, 0.3))
+    ui_settle.wait_until_settled(context.browser, _click_sleep, quiet_period)
+
+
 def click_elem(context, elem_xpath, _elem_index=0, _error_msg='', _driver_wait_time=-1, _click_sleep=-1,
-               _locate_by='presence', _click_by='driver'):
+               _locate_by='presence', _click_by='driver', _fixed_sleep=False):
     """This function clicks the specified element on the Web Page using XPath.
 
     Args:
@@ -896,7 +1164,8 @@ def click_elem(context, elem_xpath, _elem_index=0, _error_msg='', _driver_wait_t
         _elem_index (int): In the case of multiple elements, one can specify one of the indexes from the list.
         _error_msg (str): The error message to raise if the web elements are missing.
         _driver_wait_time (int): WebDriver waits for a specified number of seconds at max while looking for the element.
-        _click_sleep (int): After the element got clicked, The time in seconds to delay for the UI to update.
+        _click_sleep (int): After the element got clicked, The time in seconds to wait at most for the UI to update.
+        _fixed_sleep (bool): Always wait for the whole _click_sleep instead of until the UI has settled.
 
         _locate_by (str): The option being used to locate the element to click. Available options are:
             1. presence (default) -> The script will use wait_for_elem function to locate element.
@@ -930,11 +1199,11 @@ def click_elem(context, elem_xpath, _elem_index=0, _error_msg='', _driver_wait_t
     else:
         elem.click()
 
-    sleep(_click_sleep)
+    wait_for_ui_to_settle(context, _click_sleep, _fixed_sleep)
 
 
 def click_elem_by_text(context, elem_text, _elem_index=0, _exact_text=False, _error_msg='', _driver_wait_time=-1,
-                       _click_sleep=-1, _locate_by='presence', _click_by='driver'):
+                       _click_sleep=-1, _locate_by='presence', _click_by='driver', _fixed_sleep=False):
     """This function clicks the specified element on the Web Page using Text.
 
     Args:
@@ -944,7 +1213,8 @@ def click_elem_by_text(context, elem_text, _elem_index=0, _exact_text=False, _er
         _exact_text (bool): This flag helps to decide whether an element has the exact text or contains the text.
         _error_msg (str): The error message to raise if the web elements are missing.
         _driver_wait_time (int): WebDriver waits for a specified number of seconds at max while looking for the element.
-        _click_sleep (int): After the element got clicked, The time in seconds to delay for the UI to update.
+        _click_sleep (int): After the element got clicked, The time in seconds to wait at most for the UI to update.
+        _fixed_sleep (bool): Always wait for the whole _click_sleep instead of until the UI has settled.
 
         _locate_by (str): The option being used to locate the element to click. Available options are:
             1. presence (default) -> The script will use wait_for_elem function to locate element.
@@ -978,11 +1248,11 @@ def click_elem_by_text(context, elem_text, _elem_index=0, _exact_text=False, _er
     else:
         elem.click()
 
-    sleep(_click_sleep)
+    wait_for_ui_to_settle(context, _click_sleep, _fixed_sleep)
 
 
 def send_keys_to_elem(context, keys, elem_xpath, _elem_index=0, _error_msg='', _driver_wait_time=-1, _click_sleep=-1,
-                      _clear_keys=False, _locate_by='presence'):
+                      _clear_keys=False, _locate_by='presence', _fixed_sleep=False):
     """This function writes specified text in the editable field present on the Web Page using XPath.
 
     Args:
@@ -992,7 +1262,8 @@ def send_keys_to_elem(context, keys, elem_xpath, _elem_index=0, _error_msg='', _
         _elem_index (int): In the case of multiple elements, one can specify one of the indexes from the list.
         _error_msg (str): The error message to raise if the web elements are missing.
         _driver_wait_time (int): WebDriver waits for a specified number of seconds at max while looking for the element.
-        _click_sleep (int): After the element got clicked, The time in seconds to delay for the UI to update.
+        _click_sleep (int): After the element got clicked, The time in seconds to wait at most for the UI to update.
+        _fixed_sleep (bool): Always wait for the whole _click_sleep instead of until the UI has settled.
         _clear_keys (bool): It helps to decide whether to remove the existing text from the field.
 
         _locate_by (str): The option being used to locate the element to click. Available options are:
@@ -1023,11 +1294,12 @@ def send_keys_to_elem(context, keys, elem_xpath, _elem_index=0, _error_msg='', _
 
     elem.send_keys(keys)
 
-    sleep(_click_sleep)
+    wait_for_ui_to_settle(context, _click_sleep, _fixed_sleep)
 
 
 def send_keys_to_elem_by_text(context, keys, elem_text, _elem_index=0, _exact_text=False, _error_msg='',
-                              _driver_wait_time=-1, _click_sleep=-1, _clear_keys=False, _locate_by='presence'):
+                              _driver_wait_time=-1, _click_sleep=-1, _clear_keys=False, _locate_by='presence',
+                              _fixed_sleep=False):
     """This function writes specified text in the editable field present on the Web Page using Text.
 
     Args:
@@ -1038,7 +1310,8 @@ def send_keys_to_elem_by_text(context, keys, elem_text, _elem_index=0, _exact_te
         _exact_text (bool): This flag helps to decide whether an element has the exact text or contains the text.
         _error_msg (str): The error message to raise if the web elements are missing.
         _driver_wait_time (int): WebDriver waits for a specified number of seconds at max while looking for the element.
-        _click_sleep (int): After the element got clicked, The time in seconds to delay for the UI to update.
+        _click_sleep (int): After the element got clicked, The time in seconds to wait at most for the UI to update.
+        _fixed_sleep (bool): Always wait for the whole _click_sleep instead of until the UI has settled.
         _clear_keys (bool): It helps to decide whether to remove the existing text from the field.
 
         _locate_by (str): The option being used to locate the element to click. Available options are:
@@ -1069,15 +1342,86 @@ def send_keys_to_elem_by_text(context, keys, elem_text, _elem_index=0, _exact_te
 
     elem.send_keys(keys)
 
-    sleep(_click_sleep)
+    wait_for_ui_to_settle(context, _click_sleep, _fixed_sleep)
+
+
+FILL_FORM_SCRIPT = '''
+var fieldXpath = arguments[0];
+var fields = arguments[1];
+var failures = {};
+
+Object.keys(fields).forEach(function (label) {
+    var xpath = fieldXpath.split('{0}').join(label);
+    var field = document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+
+    if (!field) {
+        failures[label] = 'field not found';
+    } else if (field.disabled || field.readOnly) {
+        failures[label] = 'field is not editable';
+    } else {
+        // The native setter keeps frameworks that track the value of the field in sync.
+        var prototype = field instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype :
+            field instanceof HTMLSelectElement ? HTMLSelectElement.prototype : HTMLInputElement.prototype;
+
+        field.focus();
+        Object.getOwnPropertyDescriptor(prototype, 'value').set.call(field, fields[label]);
+        field.dispatchEvent(new Event('input', {bubbles: true}));
+        field.dispatchEvent(new Event('change', {bubbles: true}));
+        field.blur();
+    }
+});
+
+return failures;
+'''
+
+
+def fill_form(context, fields, _field_xpath='', _driver_wait_time=-1, _click_sleep=-1, _fixed_sleep=False):
+    """This function fills all the editable fields of a form, found by their labels, in a single script.
+
+    Args:
+        context (Context): The default object is available throughout Behave framework.
+        fields (dict): The value to enter into the field of every label. i.e. {'First Name': 'fname'}
+        _field_xpath (str): The XPath of a field with "{0}" in place of its label. i.e. FrontEndXpath.field_xpath
+        _driver_wait_time (int): WebDriver waits for a specified number of seconds at max while looking for the form.
+        _click_sleep (int): After the form got filled, The time in seconds to wait at most for the UI to update.
+        _fixed_sleep (bool): Always wait for the whole _click_sleep instead of until the UI has settled.
+
+    Raises:
+        AssertionError: An exception arises if any of the following situations occur:
+                        1) if unable to find the form.
+                        2) if any of the fields is missing or not editable.
+    """
+
+    if not fields:
+        return
+
+    if not _field_xpath:
+        _field_xpath = constants.FrontEndXpath.field_xpath.value
+
+    if _click_sleep <= 0:
+        _click_sleep = int(get_value_from_ini(context, ConfigVars.stable_elems_sleep.value))
+
+    # Waiting for the first field only, the form is rendered at once.
+    wait_for_elem(context, locators.format_xpath(_field_xpath, next(iter(fields))), _driver_wait_time=_driver_wait_time)
+
+    logger.debug(f'Fill form | Fields: {fields}')
+
+    failures = context.browser.execute_script(FILL_FORM_SCRIPT, _field_xpath, fields)
+
+    if failures:
+        failed_fields = ' | '.join(f'"{label}": {reason}' for label, reason in failures.items())
+        raise AssertionError(f'Unable to fill {len(failures)} of {len(fields)} fields | {failed_fields}')
 
+    wait_for_ui_to_settle(context, _click_sleep, _fixed_sleep)
 
-def scroll_down_to_bottom_of_page(context, _click_sleep=-1):
+
+def scroll_down_to_bottom_of_page(context, _click_sleep=-1, _fixed_sleep=False):
     """This function scrolls down to the bottem of the page.
 
     Args:
         context (Context): The default object is available throughout Behave framework.
-        _click_sleep (int): After the element got clicked, The time in seconds to delay for the UI to update.
+        _click_sleep (int): After the element got clicked, The time in seconds to wait at most for the UI to update.
+        _fixed_sleep (bool): Always wait for the whole _click_sleep instead of until the UI has settled.
     """
 
     if _click_sleep <= 0:
@@ -1089,7 +1433,7 @@ def scroll_down_to_bottom_of_page(context, _click_sleep=-1):
         # Scroll down to bottom
         context.browser.execute_script("window.scrollTo(0, document.body.scrollHeight);")
 
-        sleep(_click_sleep)
+        wait_for_ui_to_settle(context, _click_sleep, _fixed_sleep)
 
         # Calculate new scroll height and compare with last scroll height
         new_height = context.browser.execute_script("return document.body.scrollHeight")
@@ -1100,14 +1444,15 @@ def scroll_down_to_bottom_of_page(context, _click_sleep=-1):
         last_height = new_height
 
 
-def scroll_to_elem(context, elem_xpath, _driver_wait_time=-1, _click_sleep=-1):
+def scroll_to_elem(context, elem_xpath, _driver_wait_time=-1, _click_sleep=-1, _fixed_sleep=False):
     """This function scrolls down to the specific element present on the page.
 
     Args:
         context (Context): The default object is available throughout Behave framework.
         elem_xpath (str): The XPath of the element that we are looking for.
         _driver_wait_time (int): WebDriver waits for a specified number of seconds at max while looking for the element.
-        _click_sleep (int): After the element got clicked, The time in seconds to delay for the UI to update.
+        _click_sleep (int): After the element got clicked, The time in seconds to wait at most for the UI to update.
+        _fixed_sleep (bool): Always wait for the whole _click_sleep instead of until the UI has settled.
     """
 
     if _click_sleep <= 0:
@@ -1118,7 +1463,7 @@ def scroll_to_elem(context, elem_xpath, _driver_wait_time=-1, _click_sleep=-1):
     if elem:
         context.browser.execute_script('arguments[0].scrollIntoView();', elem)
 
-        sleep(_click_sleep)
+        wait_for_ui_to_settle(context, _click_sleep, _fixed_sleep)
 
         return elem
     else:
@@ -0,0 +1,71 @@
+import logging
+import threading
+
+logger = logging.getLogger('myLogger')
+
+HEADLESS_MODES = ('xvfb', 'native')
+
+_state = {'display': None}
+_lock = threading.Lock()
+
+
+def get_headless_mode(context):
+    """This function returns how the browsers run headless.
+
+    Args:
+        context (Context): The default object is available throughout Behave framework.
+
+    Raises:
+        AssertionError: An exception arises if HEADLESS_MODE is not one of HEADLESS_MODES.
+
+    Returns:
+        mode (str): "xvfb" to run the browsers on a virtual display, "native" for Chrome's own headless mode.
+    """
+
+    mode = context.config.userdata.get('HEADLESS_MODE', 'xvfb').lower()
+
+    if mode not in HEADLESS_MODES:
+        raise AssertionError(f'HEADLESS_MODE should be one of {HEADLESS_MODES}, got "{mode}".')
+
+    return mode
+
+
+def start(context):
+    """This function starts the virtual display on the first web scenario and shares it with the following ones.
+
+    Nothing is started for a run without headless, with the native headless mode or without any web scenario.
+
+    Args:
+        context (Context): The default object is available throughout Behave framework.
+    """
+
+    if not context.test_headless or get_headless_mode(context) != 'xvfb':
+        return
+
+    with _lock:
+
+        if _state['display'] is not None:
+            return
+
+        # Imported here so that runs which never start a display do not load it.
+        from xvfbwrapper import Xvfb
+
+        display = Xvfb()
+        display.start()
+        _state['display'] = display
+
+    logger.debug('--- Initiated Virtual Display ---')
+
+
+def close():
+    """This function stops the virtual display if it was started."""
+
+    with _lock:
+        display = _state['display']
+        _state['display'] = None
+
+    if display is None:
+        return
+
+    display.stop()
+    logger.debug('< Closed the virtual display.')